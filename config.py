@@ -80,6 +80,12 @@ HINDI_RISK_KEYWORDS = [
     "साजिश",  # Conspiracy
 ]
 
+# Hindi keywords match derived forms (आतंकवादी, भ्रष्टाचार); these unrelated words
+# that merely start with a keyword are excluded
+HINDI_KEYWORD_EXCLUSIONS = {
+    "आग": ["आगे", "आगामी", "आगाह", "आगमन", "आगरा"],  # ahead, upcoming, warn, arrival, Agra
+}
+
 # Combined keywords for comprehensive detection
 ALL_RISK_KEYWORDS = RISK_KEYWORDS + HINDI_RISK_KEYWORDS
 # Keywords to check for HN/tech (broader)
@@ -96,6 +102,22 @@ SPIKE_BASELINE_HOURS = 24
 SPIKE_MULTIPLIER = 2.0
 # Min items required before baseline is considered meaningful
 SPIKE_MIN_BASELINE_ITEMS = 3
+# Streaming detector: window name -> (window seconds, baseline horizon seconds).
+# Per series (platform / verdict / keyword) and window, an exponentially decayed
+# item count is compared with the EWMA mean and variance of that count.
+SPIKE_EWMA_WINDOWS = {
+    "5m": (300, 6 * 3600),
+    "1h": (3600, 24 * 3600),
+    "24h": (86400, 7 * 86400),
+}
+# Fire when count > SPIKE_MULTIPLIER * mean AND z-score >= this
+SPIKE_EWMA_Z_THRESHOLD = 3.0
+# Min items in the window, and min events seen by the series, before it can fire
+SPIKE_EWMA_MIN_COUNT = 4
+SPIKE_EWMA_MIN_EVENTS = 20
+# Startup replays content_log this many longest-windows back; a window fires only once
+# its series is 2 windows old, so keep this a little above 2
+SPIKE_EWMA_WARMUP_WINDOWS = 2.25
 # YouTube: process if views/hr > this OR total views > 50k
 YOUTUBE_VD_MIN = 100
 YOUTUBE_VIEWS_MIN = 50_000
@@ -113,3 +135,154 @@ SCAN_INTERVAL_SECONDS = 20
 NEWS_API_ARTICLE_LIMIT = 5
 RSS_ENTRIES_PER_FEED = 3
 YOUTUBE_SEARCH_LIMIT = 5
+
+# --- SCAN ENGINE ---
+# Worker threads shared by all sources in a scan cycle
+SCAN_MAX_WORKERS = 10
+# Max concurrent runs per source group (sources without an entry get 1)
+SOURCE_CONCURRENCY = {
+    "RSS": 2,
+}
+# Seconds a single source may run before the cycle stops waiting for it
+SOURCE_TIMEOUT_SECONDS = 90
+SOURCE_TIMEOUTS = {
+    "YouTube": 120,
+    "Hacker News": 60,
+    # Only the first run after a long gap (or the one-off VACUUM) takes this long
+    "Retention": 900,
+}
+
+# --- SOURCE SCHEDULER ---
+# Per-source polling: interval bounds (s), priority (higher runs first when several
+# are due), and an optional daily quota with the cost of one poll in quota units.
+# Sources without an entry use SOURCE_SCHEDULE_DEFAULT.
+SOURCE_SCHEDULE_DEFAULT = {
+    "interval": SCAN_INTERVAL_SECONDS,
+    "min_interval": SCAN_INTERVAL_SECONDS,
+    "max_interval": 600,
+    "priority": 1,
+    "daily_quota": None,
+    "cost": 1,
+}
+SOURCE_SCHEDULE = {
+    # YouTube Data API: videos.list = 1 unit per poll; keep most of the 10k/day key for other use
+    "YouTube": {"interval": 120, "min_interval": 60, "max_interval": 1800, "priority": 2,
+                "daily_quota": 2000, "cost": 1},
+    # NewsAPI free tier: 100 requests/day, each poll runs 2 queries
+    "News API": {"interval": 1800, "min_interval": 1800, "max_interval": 7200, "priority": 2,
+                 "daily_quota": 100, "cost": 2},
+    "Hacker News": {"interval": 120, "min_interval": 60, "max_interval": 900},
+    # Archive / vacuum / checkpoint hourly: min == max, so results never change the interval
+    "Retention": {"interval": 3600, "min_interval": 3600, "max_interval": 3600, "priority": 0},
+}
+# Unproductive poll -> interval * this; poll with new items -> interval / this
+SCHEDULER_BACKOFF_FACTOR = 1.5
+# How often the scheduler checks for due sources and finished runs
+SCHEDULER_TICK_SECONDS = 1
+
+# --- INGESTION PIPELINE ---
+# Headlines packed into one Groq request, and max seconds to wait for a batch to fill
+LLM_BATCH_SIZE = 8
+LLM_BATCH_MAX_WAIT_SECONDS = 3.0
+# content_log inserts are committed in transactions of up to this many rows,
+# or after waiting this long for the batch to fill
+DB_WRITE_BATCH_ROWS = 50
+DB_WRITE_MAX_WAIT_MS = 500
+# Per-stage worker threads and bounded queue size (full queue = backpressure upstream).
+# Stages with batch_size receive a list of up to that many items.
+PIPELINE_STAGES = {
+    "enrich": {"workers": 4, "queue_size": 50},
+    "classify": {"workers": 2, "queue_size": 20,
+                 "batch_size": LLM_BATCH_SIZE, "batch_wait": LLM_BATCH_MAX_WAIT_SECONDS},
+    "score": {"workers": 1, "queue_size": 50},
+    "persist": {"workers": 1, "queue_size": 100,
+                "batch_size": DB_WRITE_BATCH_ROWS, "batch_wait": DB_WRITE_MAX_WAIT_MS / 1000},
+}
+# Groq rate limit shared by all classify workers
+LLM_REQUESTS_PER_MINUTE = 30
+
+# --- DEDUP ---
+# Most recent URLs kept in memory; older ones fall back to a SQLite lookup
+SEEN_URL_INDEX_SIZE = 50_000
+
+# --- LLM VERDICT CACHE ---
+LLM_CACHE_TTL_HOURS = 72
+LLM_CACHE_MAX_ENTRIES = 20_000
+
+# --- FACT CHECK ---
+FACTCHECK_TIMEOUT_SECONDS = 6
+# How long a cached Fact Check API result is trusted, per outcome
+FACTCHECK_HIT_TTL_HOURS = 168      # claim found and rated
+FACTCHECK_MISS_TTL_HOURS = 24      # "no claims" for this query
+FACTCHECK_ERROR_TTL_MINUTES = 15   # HTTP error / timeout
+
+# --- HTTP CLIENT (shared by all scanners) ---
+HTTP_TIMEOUT_SECONDS = 10
+# Retries for connection errors, 429 and 5xx, with jittered exponential backoff
+HTTP_RETRIES = 2
+HTTP_BACKOFF_SECONDS = 0.5
+# Connection pools kept (one per host) and keep-alive connections per host
+HTTP_POOL_HOSTS = 20
+HTTP_POOL_SIZE_PER_HOST = 10
+# Use HTTP/2 via httpx when installed with the h2 extra (pip install "httpx[http2]")
+HTTP_ENABLE_HTTP2 = False
+HTTP_USER_AGENT = "Mozilla/5.0 (compatible; IICCC/2.0)"
+
+# --- FEED POLLING (conditional GET + adaptive interval per feed) ---
+FEED_MIN_INTERVAL_SECONDS = 20
+FEED_MAX_INTERVAL_SECONDS = 900
+# Unchanged poll -> interval * this; changed poll -> interval / this
+FEED_BACKOFF_FACTOR = 1.5
+
+# --- OFFLINE RESCORE (python rescore.py) ---
+RESCORE_CHUNK_ROWS = 2000
+# Sleep between chunk transactions so the listener's writes get the lock
+RESCORE_PAUSE_MS = 50
+
+# --- EXPORT (python -m exporter / dashboard download) ---
+# Rows fetched per cursor batch; also the Parquet row group size
+EXPORT_CHUNK_ROWS = 5000
+
+# --- RETENTION (python -m retention; the listener runs it per SOURCE_SCHEDULE) ---
+# Rows older than this move from fake_news.db to archive/fake_news_YYYY_MM.db
+RETENTION_HOT_DAYS = 30
+# Directory for the monthly archives, relative to the main database file
+RETENTION_ARCHIVE_DIR = "archive"
+# Rows moved per transaction, and the sleep between transactions
+RETENTION_BATCH_ROWS = 1000
+RETENTION_PAUSE_MS = 50
+# Free pages returned to the filesystem per run (incremental vacuum)
+RETENTION_VACUUM_PAGES = 5000
+
+# --- DOMAIN REPUTATION ---
+# Optional "domain,score" file (one per line, # comments). score is added to the
+# platform's base credibility, e.g. "pib.gov.in,0.3" or "fakenews.example,-0.4".
+# Entries cover subdomains too and override RiskScorer's built-in lists.
+DOMAIN_REPUTATION_FILE = "domain_reputation.csv"
+# Parsed hosts / host scores memoized per process
+DOMAIN_HOST_CACHE_SIZE = 10_000
+
+# --- LANGUAGE DETECTION ---
+# Share of letters in one Indic script needed to skip the statistical model
+LANG_SCRIPT_SHARE = 0.8
+LANG_CACHE_SIZE = 20_000
+
+# --- STORY CLUSTERING (near-duplicate headlines across platforms) ---
+# Clusters not seen for this long drop out of memory (the table keeps them)
+STORY_WINDOW_HOURS = 48
+# Word-set Jaccard similarity at which two headlines are the same story
+STORY_JACCARD_THRESHOLD = 0.6
+# MinHash LSH: bands * rows permutations; more bands = higher recall, more candidates
+STORY_MINHASH_BANDS = 16
+STORY_MINHASH_ROWS = 2
+# Log a story once it has been seen on this many platforms
+STORY_SPREAD_PLATFORMS = 3
+
+# --- DASHBOARD ---
+DASHBOARD_DB = "fake_news.db"
+DASHBOARD_PAGE_SIZE = 500
+# Cached query results are also keyed on MAX(id), so this only bounds staleness
+# of in-place updates (e.g. rescore) and of the sliding time window
+DASHBOARD_CACHE_TTL_SECONDS = 30
+# Auto-refresh period for cards, charts and the live stream
+DASHBOARD_REFRESH_SECONDS = 15
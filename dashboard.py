@@ -1,9 +1,15 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 import time
 import altair as alt
 import io
+import os
+from functools import partial
+
+import db
+import dashboard_queries as dq
+import exporter
+from config import DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_PAGE_SIZE, DASHBOARD_REFRESH_SECONDS
 
 # --- ⚙️ PAGE CONFIG ---
 st.set_page_config(
@@ -104,47 +110,63 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 📥 DATA LOADING ---
-def load_data():
+# Filters run in SQL (dashboard_queries). Results are cached per filter set and per
+# MAX(id), so reruns from widget changes or an unchanged DB never re-read the table.
+@st.cache_resource
+def init_db():
+    conn = dq.connect()
     try:
-        import os
-        if not os.path.exists('fake_news.db'):
-            conn = sqlite3.connect('fake_news.db', timeout=10)
-            conn.execute('PRAGMA journal_mode=WAL')
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS content_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    platform TEXT,
-                    title TEXT,
-                    url TEXT UNIQUE,
-                    image_url TEXT,
-                    views INTEGER,
-                    tags TEXT,
-                    panic_score REAL,
-                    verdict TEXT,
-                    virality_vd REAL,
-                    ai_explanation TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.commit()
-            conn.close()
-        
-        conn = sqlite3.connect('fake_news.db', timeout=10)
-        conn.execute('PRAGMA journal_mode=WAL')
-        df = pd.read_sql_query("SELECT * FROM content_log ORDER BY id DESC LIMIT 500", conn)
+        db.init_schema(conn)
+    finally:
         conn.close()
-        
-        if 'virality_vd' not in df.columns: 
-            df['virality_vd'] = 0.0
-        if 'ai_explanation' not in df.columns:
-            df['ai_explanation'] = ''
-        
-        return df
-        
+
+def run_query(fn, *args, **kwargs):
+    conn = dq.connect()
+    try:
+        return fn(conn, *args, **kwargs)
+    finally:
+        conn.close()
+
+def build_export(fmt, since, verdicts, platforms, min_risk, search):
+    """Deferred download: runs on click and streams the whole filtered window through a temp file."""
+    path, _ = run_query(
+        exporter.export_to_tempfile, fmt,
+        since=since, verdicts=verdicts, platforms=platforms, min_risk=min_risk, search=search
+    )
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+def get_latest_id():
+    try:
+        init_db()
+        return run_query(dq.latest_id)
     except Exception as e:
         st.error(f"Database error: {e}")
-        return pd.DataFrame()
+        return None
+
+# latest_id is unused in the bodies below but part of every cache key
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL_SECONDS, show_spinner=False)
+def load_options(latest_id, since):
+    return run_query(dq.distinct_values, "verdict", since), run_query(dq.distinct_values, "platform", since)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL_SECONDS, show_spinner=False)
+def load_summary(latest_id, since, verdicts=(), platforms=(), min_risk=0.0, search=None):
+    return run_query(dq.summary, since, verdicts, platforms, min_risk, search)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL_SECONDS, show_spinner=False)
+def load_verdict_counts(latest_id, since, verdicts, platforms, min_risk, search):
+    return run_query(dq.verdict_counts, since, verdicts, platforms, min_risk, search)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL_SECONDS, show_spinner=False)
+def load_risk_levels(latest_id, since, verdicts, platforms, min_risk, search):
+    return run_query(dq.risk_level_counts, since, verdicts, platforms, min_risk, search)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL_SECONDS, show_spinner=False)
+def load_page(latest_id, since, verdicts, platforms, min_risk, search, page):
+    return run_query(dq.fetch_page, since, verdicts, platforms, min_risk, search, page=page)
 
 # Helper function for risk level
 def get_risk_level(score):
@@ -157,9 +179,16 @@ def get_risk_level(score):
     else:
         return "LOW", "#22c55e"
 
-# Load data
-df = load_data()
-total_records = len(df)
+# The slider lives further down; its last value is in session state
+latest_id = get_latest_id()
+since = dq.cutoff(st.session_state.get("hours_back", 24))
+if latest_id is not None:
+    all_verdicts, all_platforms = load_options(latest_id, since)
+    window_stats = load_summary(latest_id, since)
+else:
+    all_verdicts, all_platforms = [], []
+    window_stats = dq.summary_defaults()
+total_records = window_stats['scanned']
 
 # --- UI LAYOUT ---
 
@@ -176,28 +205,24 @@ st.markdown("""
 
 # 2. CONTROL PANEL (always in main area - use this if sidebar is collapsed)
 with st.expander("🎛️ Control Panel — Filters, Export & Refresh", expanded=False):
-    if st.button("🔄 Refresh Data", use_container_width=True):
-        st.rerun()
+    # Any click reruns the script; the stream then reads only rows it hasn't seen
+    st.button("🔄 Refresh Data", use_container_width=True)
+    auto_refresh = st.toggle(
+        "Auto-refresh", value=True, key="auto_refresh",
+        help=f"Refresh cards, charts and the stream every {DASHBOARD_REFRESH_SECONDS}s"
+    )
     
     st.markdown("---")
     
-    if not df.empty:
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Export to CSV",
-            data=csv,
-            file_name=f"iiccc_threats_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+    # Filled in once the filters below are read
+    export_slot = st.container()
     
     st.markdown("---")
     st.markdown("### 🔍 Filters")
     
-    hours_back = st.slider("Show last N hours", 1, 168, 24, help="Filter threats by time")
+    hours_back = st.slider("Show last N hours", 1, 168, 24, key="hours_back", help="Filter threats by time")
     
-    if not df.empty:
-        all_verdicts = sorted(df['verdict'].unique().tolist())
+    if all_verdicts:
         selected_verdicts = st.multiselect(
             "Verdict Type",
             options=all_verdicts,
@@ -212,8 +237,7 @@ with st.expander("🎛️ Control Panel — Filters, Export & Refresh", expanded
         help="Show only threats above this risk level"
     )
     
-    if not df.empty:
-        all_platforms = sorted(df['platform'].unique().tolist())
+    if all_platforms:
         selected_platforms = st.multiselect(
             "Platform",
             options=all_platforms,
@@ -224,41 +248,16 @@ with st.expander("🎛️ Control Panel — Filters, Export & Refresh", expanded
         selected_platforms = []
     
     st.markdown("---")
-    if not df.empty:
+    if total_records:
         st.markdown("### 📊 Quick Stats")
-        avg_risk = df['panic_score'].mean() * 100
+        avg_risk = window_stats['avg_risk'] * 100
         st.metric("Avg Risk Score", f"{avg_risk:.1f}%")
-        top_platform = df['platform'].value_counts().index[0]
-        st.metric("Top Platform", top_platform)
-        critical_count = len(df[df['panic_score'] >= 0.8])
-        st.metric("Critical Threats", critical_count)
+        st.metric("Top Platform", window_stats['top_platform'])
+        st.metric("Critical Threats", window_stats['critical'])
     
     st.caption(f"Total records: {total_records}")
     st.caption("IICCC v2.0")
 
-# Apply filters
-filtered_df = df.copy()
-
-if not filtered_df.empty:
-    # Time filter
-    try:
-        cutoff_time = pd.Timestamp.now() - pd.Timedelta(hours=hours_back)
-        filtered_df['timestamp'] = pd.to_datetime(filtered_df['timestamp'])
-        filtered_df = filtered_df[filtered_df['timestamp'] > cutoff_time]
-    except:
-        pass
-    
-    # Verdict filter
-    if selected_verdicts:
-        filtered_df = filtered_df[filtered_df['verdict'].isin(selected_verdicts)]
-    
-    # Risk filter
-    filtered_df = filtered_df[filtered_df['panic_score'] >= (min_risk / 100)]
-    
-    # Platform filter
-    if selected_platforms:
-        filtered_df = filtered_df[filtered_df['platform'].isin(selected_platforms)]
-
 # 3. SEARCH BAR
 search_query = st.text_input(
     "", 
@@ -266,164 +265,230 @@ search_query = st.text_input(
     label_visibility="collapsed"
 )
 
-if search_query and not filtered_df.empty:
-    mask = (
-        filtered_df['title'].str.contains(search_query, case=False, na=False) | 
-        filtered_df['verdict'].str.contains(search_query, case=False, na=False) | 
-        filtered_df['tags'].str.contains(search_query, case=False, na=False)
-    )
-    filtered_df = filtered_df[mask]
-
-# 3. METRIC CARDS
-st.markdown("###")
-scanned = len(filtered_df)
-fakes = len(filtered_df[filtered_df['verdict'].str.contains("FAKE|DEEPFAKE|SCAM", case=False, na=False)]) if not filtered_df.empty else 0
-high_vel = len(filtered_df[(filtered_df['virality_vd'] > 50) | (filtered_df['views'] > 50000)]) if not filtered_df.empty else 0
-critical = len(filtered_df[filtered_df['panic_score'] >= 0.8]) if not filtered_df.empty else 0
-
-c1, c2, c3, c4 = st.columns(4)
-
-def card(title, value, is_danger=False):
-    text_color = "#ef4444" if is_danger else "var(--text-color)"
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-header">{title}</div>
-        <div class="metric-value" style="color: {text_color}">{value}</div>
-    </div>
-    """, unsafe_allow_html=True)
+# Apply filters (in SQL). Selecting every option is the same as no filter.
+# `since` is recomputed inside each fragment so timed refreshes slide the window.
+filter_args = (
+    hours_back,
+    tuple(selected_verdicts) if len(selected_verdicts) < len(all_verdicts) else (),
+    tuple(selected_platforms) if len(selected_platforms) < len(all_platforms) else (),
+    min_risk / 100,
+    search_query.strip() or None,
+)
 
-with c1: card("Threats Scanned", f"{scanned:,}")
-with c2: card("Confirmed Fakes", f"{fakes:02d}", is_danger=True)
-with c3: card("High Velocity", f"{high_vel:02d}")
-with c4: card("Critical Alerts", f"{critical:02d}", is_danger=True)
+def current_filters(hours_back, *rest):
+    return (dq.cutoff(hours_back),) + rest
 
-# 4. CHARTS
-st.markdown("###")
-col_left, col_mid, col_right = st.columns(3)
+def tail_rows(latest_id, filter_args):
+    """
+    Newest DASHBOARD_PAGE_SIZE matching rows, held in session state. A refresh only
+    reads rows with id above the last id seen, so its cost scales with new rows;
+    changing a filter reloads the first page.
+    """
+    filters = current_filters(*filter_args)
+    state = st.session_state.get("tail")
+    if state is None or state["key"] != filter_args:
+        state = {"key": filter_args, "frame": load_page(latest_id, *filters, 0), "seen_id": latest_id}
+    elif latest_id > state["seen_id"]:
+        new_rows = run_query(dq.fetch_after, state["seen_id"], latest_id, *filters[:4])
+        if not new_rows.empty:
+            frame = pd.concat([new_rows, state["frame"]], ignore_index=True)
+            state["frame"] = frame.sort_values(["ts", "id"], ascending=False).head(DASHBOARD_PAGE_SIZE)
+        state["seen_id"] = latest_id
+    # Rows that slid out of the time window
+    state["frame"] = state["frame"][state["frame"]["ts"] >= filters[0]]
+    st.session_state["tail"] = state
+    return state["frame"]
 
-# Streamlit handles light/dark themes natively for Altair via theme="streamlit"
+def first_page(latest_id, filter_args):
+    """Stream's first page: the incremental tail, or ranked results when searching."""
+    if filter_args[-1]:
+        return load_page(latest_id, *current_filters(*filter_args), 0)
+    return tail_rows(latest_id, filter_args)
 
-with col_left:
-    st.markdown('<div class="content-card"><h4>🛡️ Threat Classification</h4>', unsafe_allow_html=True)
-    if not filtered_df.empty:
-        verdict_counts = filtered_df['verdict'].value_counts().reset_index()
-        verdict_counts.columns = ['Verdict', 'Count']
-        
-        pie_chart = alt.Chart(verdict_counts).mark_arc(innerRadius=60, padAngle=0.03).encode(
-            theta=alt.Theta('Count:Q'),
-            color=alt.Color('Verdict:N', scale=alt.Scale(scheme='set2')),
-            tooltip=['Verdict', 'Count']
-        ).properties(height=280)
-        
-        st.altair_chart(pie_chart, use_container_width=True)
-    else: 
-        st.info("No data matches your filters.")
-    st.markdown('</div>', unsafe_allow_html=True)
+# Cards, charts and the stream re-run on their own on the refresh timer;
+# cached queries mean a tick with no new rows reads nothing.
+refresh_every = DASHBOARD_REFRESH_SECONDS if auto_refresh else None
+
+# 3. METRIC CARDS + 4. CHARTS
+@st.fragment(run_every=refresh_every)
+def overview(filter_args):
+    latest_id = get_latest_id()
+    if latest_id is None:
+        return
+    filters = current_filters(*filter_args)
+    stats = load_summary(latest_id, *filters)
+    has_results = stats['scanned'] > 0
+
+    st.markdown("###")
 
-with col_mid:
-    st.markdown('<div class="content-card"><h4>⚠️ Risk Distribution</h4>', unsafe_allow_html=True)
-    if not filtered_df.empty:
-        # Create risk level categories
-        risk_levels = filtered_df['panic_score'].apply(
-            lambda x: 'CRITICAL' if x >= 0.8 else ('HIGH' if x >= 0.6 else ('MEDIUM' if x >= 0.4 else 'LOW'))
-        ).value_counts().reset_index()
-        risk_levels.columns = ['Level', 'Count']
+    c1, c2, c3, c4 = st.columns(4)
+
+    def card(title, value, is_danger=False):
+        text_color = "#ef4444" if is_danger else "var(--text-color)"
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-header">{title}</div>
+            <div class="metric-value" style="color: {text_color}">{value}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with c1: card("Threats Scanned", f"{stats['scanned']:,}")
+    with c2: card("Confirmed Fakes", f"{stats['fakes']:02d}", is_danger=True)
+    with c3: card("High Velocity", f"{stats['high_velocity']:02d}")
+    with c4: card("Critical Alerts", f"{stats['critical']:02d}", is_danger=True)
+
+    # 4. CHARTS
+    st.markdown("###")
+    col_left, col_mid, col_right = st.columns(3)
+
+    # Streamlit handles light/dark themes natively for Altair via theme="streamlit"
+
+    with col_left:
+        st.markdown('<div class="content-card"><h4>🛡️ Threat Classification</h4>', unsafe_allow_html=True)
+        if has_results:
+            verdict_counts = load_verdict_counts(latest_id, *filters)
+            
+            pie_chart = alt.Chart(verdict_counts).mark_arc(innerRadius=60, padAngle=0.03).encode(
+                theta=alt.Theta('Count:Q'),
+                color=alt.Color('Verdict:N', scale=alt.Scale(scheme='set2')),
+                tooltip=['Verdict', 'Count']
+            ).properties(height=280)
+            
+            st.altair_chart(pie_chart, use_container_width=True)
+        else: 
+            st.info("No data matches your filters.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col_mid:
+        st.markdown('<div class="content-card"><h4>⚠️ Risk Distribution</h4>', unsafe_allow_html=True)
+        if has_results:
+            # Risk level categories are bucketed in SQL
+            risk_levels = load_risk_levels(latest_id, *filters)
+            
+            bar_chart = alt.Chart(risk_levels).mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6, size=35).encode(
+                x=alt.X('Level', sort=['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'], axis=alt.Axis(title=None, labelAngle=0)),
+                y=alt.Y('Count', title='Volume'),
+                color=alt.Color('Level', scale=alt.Scale(
+                    domain=['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'],
+                    range=['#ef4444', '#f97316', '#eab308', '#22c55e']
+                ), legend=None),
+                tooltip=['Level', 'Count']
+            ).properties(height=280)
+            
+            st.altair_chart(bar_chart, use_container_width=True)
+        else: 
+            st.info("No data matches your filters.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col_right:
+        st.markdown('<div class="content-card"><h4>📈 Viral Velocity Trend</h4>', unsafe_allow_html=True)
+        if has_results:
+            line_data = first_page(latest_id, filter_args).head(50).reset_index(drop=True).reset_index()
+            
+            # Area + Line Chart
+            base = alt.Chart(line_data).encode(x=alt.X('index', title='Recent Scans', axis=alt.Axis(labels=False)))
+            
+            area = base.mark_area(
+                color=alt.Gradient(
+                    gradient='linear',
+                    stops=[alt.GradientStop(color='rgba(99, 102, 241, 0.4)', offset=0), alt.GradientStop(color='rgba(99, 102, 241, 0.0)', offset=1)],
+                    x1=1, x2=1, y1=1, y2=0
+                )
+            ).encode(y='virality_vd')
+            
+            line = base.mark_line(point=alt.OverlayMarkDef(filled=False, fill='white', size=40), color='#6366f1', strokeWidth=3).encode(
+                y=alt.Y('virality_vd', title='Virality (v_d)'), 
+                tooltip=['title', 'virality_vd']
+            )
+            
+            chart = (area + line).properties(height=280)
+            st.altair_chart(chart, use_container_width=True)
+        else: 
+            st.info("No data matches your filters.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+overview(filter_args)
+
+# 5. LIVE THREAT STREAM WITH COLOR CODING
+@st.fragment(run_every=refresh_every)
+def live_stream(filter_args, total_records):
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("**🚨 Live Threat Stream**")
+
+    latest_id = get_latest_id()
+    filters = current_filters(*filter_args)
+    stats = load_summary(latest_id, *filters) if latest_id is not None else dq.summary_defaults()
+    search_query = filter_args[-1]
+
+    if stats['scanned'] > 0:
+        pages = -(-stats['scanned'] // DASHBOARD_PAGE_SIZE)
+        page = 0
+        if pages > 1:
+            page = st.number_input(
+                f"Page (of {pages}, {DASHBOARD_PAGE_SIZE} rows each)", min_value=1, max_value=pages, value=1
+            ) - 1
+        page_df = first_page(latest_id, filter_args) if page == 0 else load_page(latest_id, *filters, page)
         
-        bar_chart = alt.Chart(risk_levels).mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6, size=35).encode(
-            x=alt.X('Level', sort=['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'], axis=alt.Axis(title=None, labelAngle=0)),
-            y=alt.Y('Count', title='Volume'),
-            color=alt.Color('Level', scale=alt.Scale(
-                domain=['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'],
-                range=['#ef4444', '#f97316', '#eab308', '#22c55e']
-            ), legend=None),
-            tooltip=['Level', 'Count']
-        ).properties(height=280)
+        cols = ['timestamp', 'platform', 'panic_score', 'verdict', 'views', 'title', 'url', 'ai_explanation']
+        # Searches are ranked by relevance and carry a highlighted snippet
+        if 'snippet' in page_df.columns:
+            cols.append('snippet')
+        display_df = page_df[cols].copy()
         
-        st.altair_chart(bar_chart, use_container_width=True)
-    else: 
-        st.info("No data matches your filters.")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col_right:
-    st.markdown('<div class="content-card"><h4>📈 Viral Velocity Trend</h4>', unsafe_allow_html=True)
-    if not filtered_df.empty:
-        line_data = filtered_df.head(50).reset_index()
+        # Add risk level column
+        display_df['risk_level'] = display_df['panic_score'].apply(lambda x: get_risk_level(x or 0)[0])
         
-        # Area + Line Chart
-        base = alt.Chart(line_data).encode(x=alt.X('index', title='Recent Scans', axis=alt.Axis(labels=False)))
+        display_df['panic_score'] = display_df['panic_score'].fillna(0)
+        display_df['risk_pct'] = (display_df['panic_score'] * 100).astype(int)
         
-        area = base.mark_area(
-            color=alt.Gradient(
-                gradient='linear',
-                stops=[alt.GradientStop(color='rgba(99, 102, 241, 0.4)', offset=0), alt.GradientStop(color='rgba(99, 102, 241, 0.0)', offset=1)],
-                x1=1, x2=1, y1=1, y2=0
-            )
-        ).encode(y='virality_vd')
+        col_order = ['timestamp', 'platform', 'risk_level', 'risk_pct', 'verdict', 'views', 'title', 'ai_explanation', 'url']
+        if 'snippet' in display_df.columns:
+            col_order.insert(col_order.index('title') + 1, 'snippet')
+        display_df = display_df[col_order]
         
-        line = base.mark_line(point=alt.OverlayMarkDef(filled=False, fill='white', size=40), color='#6366f1', strokeWidth=3).encode(
-            y=alt.Y('virality_vd', title='Virality (v_d)'), 
-            tooltip=['title', 'virality_vd']
-        )
+        col_config = {
+            "timestamp": st.column_config.DatetimeColumn("Time", format="HH:mm"),
+            "platform": st.column_config.TextColumn("Platform", width="small"),
+            "risk_level": st.column_config.TextColumn("Risk", width="small"),
+            "risk_pct": st.column_config.ProgressColumn("Score", format="%d%%", min_value=0, max_value=100),
+            "verdict": st.column_config.TextColumn("Verdict", width="medium"),
+            "views": st.column_config.NumberColumn("Reach", format="%d"),
+            "title": st.column_config.TextColumn("Headline", width="large"),
+            "url": st.column_config.LinkColumn("Source"),
+            "ai_explanation": st.column_config.TextColumn("AI Reason", width="medium", help="Why the AI classified it this way"),
+            "snippet": st.column_config.TextColumn("Match", width="large"),
+        }
         
-        chart = (area + line).properties(height=280)
-        st.altair_chart(chart, use_container_width=True)
-    else: 
-        st.info("No data matches your filters.")
+        st.dataframe(
+            display_df, 
+            use_container_width=True,
+            column_config=col_config,
+            hide_index=True,
+            height=400
+        )
+    elif search_query:
+        st.warning(f"No results for '{search_query}'")
+    elif total_records > 0:
+        st.info("No data matches your filters. Try adjusting sidebar settings.")
+    else:
+        st.info("System is scanning. First threats will appear shortly.")
+
     st.markdown('</div>', unsafe_allow_html=True)
 
-# 5. LIVE THREAT STREAM WITH COLOR CODING
-st.markdown('<div class="content-card">', unsafe_allow_html=True)
-st.markdown("**🚨 Live Threat Stream**")
-
-if not filtered_df.empty:
-    cols = ['timestamp', 'platform', 'panic_score', 'verdict', 'views', 'title', 'url']
-    if 'ai_explanation' in filtered_df.columns:
-        cols.append('ai_explanation')
-    display_df = filtered_df[cols].copy()
-    
-    # Add risk level column
-    display_df['risk_level'] = display_df['panic_score'].apply(lambda x: get_risk_level(x)[0])
-    
-    if 'panic_score' in display_df.columns:
-        display_df['panic_score'] = display_df['panic_score'].fillna(0)
-        display_df['risk_pct'] = (display_df['panic_score'] * 100).astype(int)
-    
-    col_order = ['timestamp', 'platform', 'risk_level', 'risk_pct', 'verdict', 'views', 'title']
-    if 'ai_explanation' in display_df.columns:
-        col_order.append('ai_explanation')
-    col_order.append('url')
-    display_df = display_df[col_order]
-    
-    col_config = {
-        "timestamp": st.column_config.DatetimeColumn("Time", format="HH:mm"),
-        "platform": st.column_config.TextColumn("Platform", width="small"),
-        "risk_level": st.column_config.TextColumn("Risk", width="small"),
-        "risk_pct": st.column_config.ProgressColumn("Score", format="%d%%", min_value=0, max_value=100),
-        "verdict": st.column_config.TextColumn("Verdict", width="medium"),
-        "views": st.column_config.NumberColumn("Reach", format="%d"),
-        "title": st.column_config.TextColumn("Headline", width="large"),
-        "url": st.column_config.LinkColumn("Source")
-    }
-    if 'language' in display_df.columns:
-        col_config["language"] = st.column_config.TextColumn("Language", width="small")
-    if 'ai_explanation' in display_df.columns:
-        col_config["ai_explanation"] = st.column_config.TextColumn("AI Reason", width="medium", help="Why the AI classified it this way")
-    
-    st.dataframe(
-        display_df, 
-        use_container_width=True,
-        column_config=col_config,
-        hide_index=True,
-        height=400
-    )
-elif search_query:
-    st.warning(f"No results for '{search_query}'")
-elif total_records > 0:
-    st.info("No data matches your filters. Try adjusting sidebar settings.")
-else:
-    st.info("System is scanning. First threats will appear shortly.")
+live_stream(filter_args, total_records)
 
-st.markdown('</div>', unsafe_allow_html=True)
+with export_slot:
+    if total_records:
+        export_format = st.selectbox("Export format", exporter.available_formats(), key="export_format")
+        extension, mime = exporter.EXPORT_FORMATS[export_format]
+        st.download_button(
+            label=f"📥 Export {export_format.upper()} (all matching rows)",
+            data=partial(build_export, export_format, *current_filters(*filter_args)),
+            file_name=f"iiccc_threats_{pd.Timestamp.now().strftime('%Y%m%d')}.{extension}",
+            mime=mime,
+            on_click="ignore",
+            use_container_width=True
+        )
 
 # 6. FOOTER
 st.markdown('<div class="footer">IICCC System v2.0 | Multi-Factor Risk Analysis | Restricted Access</div>', unsafe_allow_html=True)
@@ -0,0 +1,227 @@
+"""
+Read-side queries for the dashboard.
+Every filter (time window, verdicts, platforms, minimum risk, search text) is applied
+in parameterized SQL against the ts/verdict/platform indexes, so results cover the
+whole history instead of the last N rows, and only one page is ever loaded.
+Search text goes through the FTS5 index (search_index); matches are ranked by BM25.
+Cards, charts and filter options read the minute/hour rollups (rollups.py) instead,
+unless a risk threshold or search text needs the raw rows. Raw-row queries whose
+window reaches past the hot table also read the monthly archives (retention.py),
+searches included: each archive has its own FTS index.
+"""
+
+import time
+
+import pandas as pd
+
+import db
+import retention
+import rollups
+import search_index
+from config import DASHBOARD_DB, DASHBOARD_PAGE_SIZE
+
+# Risk buckets shared by the cards, the distribution chart and the rollups
+RISK_LEVEL_SQL = rollups.RISK_LEVEL_EXPR.format(r='')
+FAKE_VERDICT_SQL = "(verdict LIKE '%FAKE%' OR verdict LIKE '%SCAM%')"
+HIGH_VELOCITY_SQL = rollups.HIGH_VELOCITY_EXPR.format(r='')
+
+
+def connect(db_name=None):
+    return db.connect(db_name or DASHBOARD_DB)
+
+
+def cutoff(hours_back, granularity=60):
+    """Window start in epoch seconds, rounded down so cache keys stay stable within a minute."""
+    now = int(time.time()) // granularity * granularity
+    return now - int(hours_back * 3600)
+
+
+def where_clause(since, verdicts=(), platforms=(), min_risk=0.0, search=None, prefix='', fts_schemas=("main",)):
+    """
+    Build the WHERE clause and its parameters. Empty verdicts/platforms mean "all".
+    prefix qualifies content_log columns (e.g. 'c.') when joined with content_fts.
+    Search text is matched in the content_fts of each of fts_schemas (see content_source).
+    """
+    clauses = [f"{prefix}ts >= ?"]
+    params = [since]
+    if verdicts:
+        clauses.append(f"{prefix}verdict IN ({','.join('?' * len(verdicts))})")
+        params.extend(verdicts)
+    if platforms:
+        clauses.append(f"{prefix}platform IN ({','.join('?' * len(platforms))})")
+        params.extend(platforms)
+    if min_risk:
+        clauses.append(f"{prefix}panic_score >= ?")
+        params.append(min_risk)
+    match = search_index.fts_query(search)
+    if match:
+        clauses.append(search_index.match_clause(fts_schemas, prefix))
+        params.extend([match] * len(fts_schemas))
+    return " AND ".join(clauses), params
+
+
+def content_source(conn, since, search=None):
+    """
+    (source, fts_schemas): content_log or a view adding the archived months the window
+    reaches, and the databases whose content_fts a search must match in (for where_clause).
+    """
+    parts = retention.attach_partitions(conn, "content_log", since, search=bool(search_index.fts_query(search)))
+    return retention.span_view(conn, "content_log", parts), ("main",) + tuple(parts)
+
+
+def latest_id(conn):
+    """Highest content_log id; changes whenever a row is added."""
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM content_log").fetchone()[0]
+
+
+def fetch_page(conn, since, verdicts=(), platforms=(), min_risk=0.0, search=None, page=0, page_size=None):
+    """One page of matching rows: newest first, or best BM25 match first with a snippet when searching."""
+    page_size = page_size or DASHBOARD_PAGE_SIZE
+    match = search_index.fts_query(search)
+    if match:
+        # One ranked SELECT per database (hot + archived months), merged by BM25 rank
+        schemas = ("main",) + tuple(retention.attach_partitions(conn, "content_log", since, search=True))
+        wanted = retention.columns(conn, "content_log")
+        where, where_params = where_clause(since, verdicts, platforms, min_risk, prefix='c.')
+        selects, params = [], []
+        for schema in schemas:
+            selects.append(f"""
+                SELECT {retention.cold_select(conn, "content_log", schema, wanted, prefix='c.')},
+                       {search_index.SNIPPET_SQL} AS snippet, {search_index.RANK_SQL} AS rank
+                FROM {schema}.content_fts JOIN {schema}.content_log c ON c.id = content_fts.rowid
+                WHERE content_fts MATCH ? AND {where}
+            """)
+            params += [match] + where_params
+        sql = " UNION ALL ".join(selects) + " ORDER BY rank LIMIT ? OFFSET ?"
+    else:
+        where, params = where_clause(since, verdicts, platforms, min_risk)
+        source, _ = content_source(conn, since)
+        sql = f"SELECT * FROM {source} WHERE {where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?"
+    df = pd.read_sql_query(sql, conn, params=params + [page_size, page * page_size])
+    df['timestamp'] = pd.to_datetime(df['ts'], unit='s')
+    return df
+
+
+def fetch_after(conn, after_id, upto_id, since, verdicts=(), platforms=(), min_risk=0.0, page_size=None):
+    """Matching rows with after_id < id <= upto_id, newest first: a primary-key range scan."""
+    page_size = page_size or DASHBOARD_PAGE_SIZE
+    where, params = where_clause(since, verdicts, platforms, min_risk)
+    df = pd.read_sql_query(
+        f"SELECT * FROM content_log WHERE id > ? AND id <= ? AND {where} ORDER BY ts DESC, id DESC LIMIT ?",
+        conn, params=[after_id, upto_id] + params + [page_size],
+    )
+    df['timestamp'] = pd.to_datetime(df['ts'], unit='s')
+    return df
+
+
+def use_rollups(min_risk=0.0, search=None):
+    """Rollups are bucketed by risk level, not score, and know nothing about text."""
+    return not min_risk and not search_index.fts_query(search)
+
+
+def rollup_source(since, verdicts=(), platforms=()):
+    """
+    Subquery over the window's buckets: rollup_hour for whole hours, rollup_minute
+    for the partial hour at the start. since is minute-aligned (cutoff), so the
+    result matches ts >= since exactly.
+    """
+    hour_start = -(-since // 3600) * 3600
+    dims, dim_params = [], []
+    if verdicts:
+        dims.append(f"verdict IN ({','.join('?' * len(verdicts))})")
+        dim_params.extend(verdicts)
+    if platforms:
+        dims.append(f"platform IN ({','.join('?' * len(platforms))})")
+        dim_params.extend(platforms)
+    extra = "".join(f" AND {d}" for d in dims)
+    sql = f"""(
+        SELECT * FROM rollup_hour WHERE bucket >= ?{extra}
+        UNION ALL
+        SELECT * FROM rollup_minute WHERE bucket >= ? AND bucket < ?{extra}
+    )"""
+    return sql, [hour_start] + dim_params + [since, hour_start] + dim_params
+
+
+def summary_defaults():
+    return {"scanned": 0, "fakes": 0, "high_velocity": 0, "critical": 0, "avg_risk": 0.0, "top_platform": None}
+
+
+def summary(conn, since, verdicts=(), platforms=(), min_risk=0.0, search=None):
+    """Counts behind the metric cards and quick stats."""
+    if use_rollups(min_risk, search):
+        source, params = rollup_source(since, verdicts, platforms)
+        row = conn.execute(f"""
+            SELECT COALESCE(SUM(items), 0),
+                   COALESCE(SUM(CASE WHEN {FAKE_VERDICT_SQL} THEN items END), 0),
+                   COALESCE(SUM(high_velocity), 0),
+                   COALESCE(SUM(CASE WHEN risk_level = 'CRITICAL' THEN items END), 0),
+                   SUM(risk_sum) / NULLIF(SUM(scored), 0)
+            FROM {source}
+        """, params).fetchone()
+        top = conn.execute(f"""
+            SELECT NULLIF(platform, '') FROM {source}
+            GROUP BY platform HAVING SUM(items) > 0 ORDER BY SUM(items) DESC, platform LIMIT 1
+        """, params).fetchone()
+    else:
+        source, schemas = content_source(conn, since, search)
+        where, params = where_clause(since, verdicts, platforms, min_risk, search, fts_schemas=schemas)
+        row = conn.execute(f"""
+            SELECT COUNT(*),
+                   COALESCE(SUM({FAKE_VERDICT_SQL}), 0),
+                   COALESCE(SUM({HIGH_VELOCITY_SQL}), 0),
+                   COALESCE(SUM(panic_score >= 0.8), 0),
+                   AVG(panic_score)
+            FROM {source} WHERE {where}
+        """, params).fetchone()
+        top = conn.execute(f"""
+            SELECT platform FROM {source} WHERE {where}
+            GROUP BY platform ORDER BY COUNT(*) DESC, platform LIMIT 1
+        """, params).fetchone()
+    return {
+        "scanned": row[0],
+        "fakes": row[1],
+        "high_velocity": row[2],
+        "critical": row[3],
+        "avg_risk": row[4] or 0.0,
+        "top_platform": top[0] if top else None,
+    }
+
+
+def verdict_counts(conn, since, verdicts=(), platforms=(), min_risk=0.0, search=None):
+    if use_rollups(min_risk, search):
+        source, params = rollup_source(since, verdicts, platforms)
+        sql = f"""
+            SELECT NULLIF(verdict, '') AS Verdict, SUM(items) AS Count FROM {source}
+            GROUP BY verdict HAVING Count > 0 ORDER BY Count DESC, verdict
+        """
+    else:
+        source, schemas = content_source(conn, since, search)
+        where, params = where_clause(since, verdicts, platforms, min_risk, search, fts_schemas=schemas)
+        sql = (
+            f"SELECT verdict AS Verdict, COUNT(*) AS Count FROM {source} WHERE {where} "
+            f"GROUP BY verdict ORDER BY Count DESC, verdict"
+        )
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def risk_level_counts(conn, since, verdicts=(), platforms=(), min_risk=0.0, search=None):
+    if use_rollups(min_risk, search):
+        source, params = rollup_source(since, verdicts, platforms)
+        sql = f"SELECT risk_level AS Level, SUM(items) AS Count FROM {source} GROUP BY Level HAVING Count > 0"
+    else:
+        source, schemas = content_source(conn, since, search)
+        where, params = where_clause(since, verdicts, platforms, min_risk, search, fts_schemas=schemas)
+        sql = f"SELECT {RISK_LEVEL_SQL} AS Level, COUNT(*) AS Count FROM {source} WHERE {where} GROUP BY Level"
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def distinct_values(conn, column, since):
+    """Distinct verdicts or platforms inside the window, for the filter widgets."""
+    if column not in ("verdict", "platform"):
+        raise ValueError(f"Unsupported column: {column}")
+    source, params = rollup_source(since)
+    rows = conn.execute(
+        f"SELECT {column} FROM {source} WHERE {column} != '' GROUP BY {column} HAVING SUM(items) > 0 ORDER BY {column}",
+        params,
+    ).fetchall()
+    return [r[0] for r in rows]
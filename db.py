@@ -0,0 +1,240 @@
+"""
+Database layer - shared connections, the content_log schema and the batched writer.
+"""
+
+import sqlite3
+import threading
+import time
+
+
+def connect(db_name="fake_news.db"):
+    """Open a long-lived WAL connection that may be shared across threads (callers lock)."""
+    conn = sqlite3.connect(db_name, timeout=10, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def init_schema(conn):
+    """Create content_log / spikes, add later columns, and run pending migrations."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS content_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT,
+            title TEXT,
+            url TEXT UNIQUE,
+            image_url TEXT,
+            views INTEGER,
+            tags TEXT,
+            panic_score REAL,
+            verdict TEXT,
+            virality_vd REAL,
+            ai_explanation TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for column in (
+        "ai_explanation TEXT",
+        "language TEXT DEFAULT 'en'",
+        "corroboration_score REAL",
+    ):
+        try:
+            cursor.execute(f"ALTER TABLE content_log ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS spikes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT,
+            title TEXT,
+            spike_rate REAL,
+            baseline_rate REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    migrate(conn)
+
+
+def _add_epoch_ts(conn):
+    """
+    Store event time as an indexed integer epoch (UTC seconds) in `ts`.
+    `timestamp` is CURRENT_TIMESTAMP text in UTC, so the backfill is exact.
+    """
+    for table in ("content_log", "spikes"):
+        try:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN ts INTEGER")
+        except sqlite3.OperationalError:
+            pass
+        conn.execute(f"UPDATE {table} SET ts = CAST(strftime('%s', timestamp) AS INTEGER) WHERE ts IS NULL")
+        # Writers that don't set ts still get one
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fill_ts AFTER INSERT ON {table}
+            WHEN NEW.ts IS NULL
+            BEGIN
+                UPDATE {table} SET ts = CAST(strftime('%s', NEW.timestamp) AS INTEGER) WHERE id = NEW.id;
+            END
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_log_ts ON content_log(ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_log_platform_ts ON content_log(platform, ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_log_verdict_ts ON content_log(verdict, ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_spikes_platform_ts ON spikes(platform, ts)")
+
+
+def _add_spike_window(conn):
+    """Record which detector window and series (e.g. 'verdict:SCAM') fired a spike."""
+    for column in ("window TEXT", "series TEXT"):
+        try:
+            conn.execute(f"ALTER TABLE spikes ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass
+
+
+def _add_ai_score(conn):
+    """Keep the LLM risk next to the composite so rows can be rescored offline."""
+    try:
+        conn.execute("ALTER TABLE content_log ADD COLUMN ai_score REAL")
+    except sqlite3.OperationalError:
+        pass
+
+
+def _add_story_id(conn):
+    """Link each row to its near-duplicate cluster in story_clusters."""
+    try:
+        conn.execute("ALTER TABLE content_log ADD COLUMN story_id INTEGER")
+    except sqlite3.OperationalError:
+        pass
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_log_story_id ON content_log(story_id)")
+
+
+def _add_fulltext_index(conn):
+    """FTS5 index over title/tags/ai_explanation/verdict, synced by triggers."""
+    import search_index  # search_index imports db for its CLI
+    search_index.create_index(conn)
+
+
+def _add_rollups(conn):
+    """Per-minute / per-hour counts by platform, verdict and risk level, kept by triggers."""
+    import rollups
+    rollups.create_rollups(conn)
+
+
+def _add_archived_urls(conn):
+    """URLs of rows retention moved out of content_log, still checked by dedup."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS archived_urls (
+            url TEXT PRIMARY KEY,
+            ts INTEGER
+        ) WITHOUT ROWID
+    """)
+
+
+# Applied in order; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    _add_epoch_ts,
+    _add_spike_window,
+    _add_ai_score,
+    _add_story_id,
+    _add_fulltext_index,
+    _add_rollups,
+    _add_archived_urls,
+]
+
+
+def migrate(conn):
+    """Run every migration newer than the database's user_version, each in its own transaction."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        with conn:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+
+
+class ContentWriter:
+    """
+    Writes content_log rows over one long-lived connection.
+    Each write_batch call is a single transaction (one fsync) using
+    INSERT ... ON CONFLICT(url) DO NOTHING, so duplicates cost no extra query.
+    """
+
+    INSERT_SQL = '''
+        INSERT INTO content_log (platform, title, url, image_url, views, tags, panic_score, verdict, virality_vd, ai_explanation, language, corroboration_score, ai_score, story_id, ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO NOTHING
+    '''
+
+    def __init__(self, db_name="fake_news.db"):
+        self.conn = connect(db_name)
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.duplicates = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self._window_start = time.monotonic()
+        self._window_rows = 0
+
+    @staticmethod
+    def _row(data):
+        return (
+            data['platform'],
+            data['title'],
+            data['url'],
+            data.get('image_url'),
+            data['views'],
+            data['tags'],
+            data['risk'],
+            data['verdict'],
+            data['vd'],
+            data.get('ai_explanation', ''),
+            data.get('language', 'English'),
+            data.get('corroboration_score'),
+            data.get('ai_score'),
+            data.get('story_id'),
+            data['ts'],
+        )
+
+    def write_batch(self, records):
+        """Insert records in one transaction. Returns the records that were new."""
+        start = time.monotonic()
+        inserted = []
+        with self._lock:
+            with self.conn:
+                for data in records:
+                    data.setdefault('ts', int(time.time()))
+                    cursor = self.conn.execute(self.INSERT_SQL, self._row(data))
+                    if cursor.rowcount:
+                        data['id'] = cursor.lastrowid
+                        inserted.append(data)
+            self.flushes += 1
+            self.flush_seconds += time.monotonic() - start
+            self.rows_written += len(inserted)
+            self.duplicates += len(records) - len(inserted)
+            self._window_rows += len(inserted)
+        return inserted
+
+    def stats(self):
+        """Totals plus rows/sec since the previous stats() call."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            rate = self._window_rows / elapsed if elapsed > 0 else 0.0
+            self._window_start, self._window_rows = now, 0
+            return {
+                "rows_written": self.rows_written,
+                "duplicates": self.duplicates,
+                "flushes": self.flushes,
+                "rows_per_flush": self.rows_written / self.flushes if self.flushes else 0.0,
+                "ms_per_flush": 1000 * self.flush_seconds / self.flushes if self.flushes else 0.0,
+                "rows_per_sec": rate,
+            }
+
+    def log_stats(self, logger):
+        s = self.stats()
+        if s["flushes"]:
+            logger.info(
+                f"DB writes: {s['rows_written']} rows in {s['flushes']} transactions "
+                f"({s['rows_per_flush']:.1f} rows/txn, {s['ms_per_flush']:.1f} ms/txn, "
+                f"{s['rows_per_sec']:.2f} rows/s, {s['duplicates']} duplicates)"
+            )
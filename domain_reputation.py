@@ -0,0 +1,69 @@
+"""
+Per-domain credibility adjustments keyed by hostname.
+A URL is parsed once (memoized), then its host and each parent domain are looked up
+in a dict, most specific first: a handful of hash lookups per URL however many
+domains are loaded.
+"""
+
+import os
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from config import DOMAIN_HOST_CACHE_SIZE
+
+
+@lru_cache(maxsize=DOMAIN_HOST_CACHE_SIZE)
+def parse_host(url):
+    """Lowercased hostname of url without a trailing dot, or '' if it has none."""
+    try:
+        host = urlsplit(url if '//' in url else f'//{url}').hostname or ''
+    except ValueError:
+        return ''
+    return host.rstrip('.')
+
+
+class DomainReputation:
+    """Map of domain -> score delta, matched on the host or any parent domain."""
+
+    def __init__(self, defaults=None, path=None):
+        self.scores = {}
+        self.score_for_host = lru_cache(maxsize=DOMAIN_HOST_CACHE_SIZE)(self._score_for_host)
+        for domain, score in (defaults or {}).items():
+            self.add(domain, score)
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def add(self, domain, score):
+        self.scores[domain.strip().lower().rstrip('.')] = float(score)
+
+    def load(self, path):
+        """Read "domain,score" lines; blank lines and # comments are ignored. Returns entries loaded."""
+        loaded = 0
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                domain, _, score = line.partition(',')
+                try:
+                    self.add(domain, score)
+                except ValueError:
+                    continue  # header row or malformed score
+                loaded += 1
+        self.score_for_host.cache_clear()
+        return loaded
+
+    def _score_for_host(self, host):
+        # a.b.example.com -> a.b.example.com, b.example.com, example.com, com
+        while host:
+            score = self.scores.get(host)
+            if score is not None:
+                return score
+            host = host.partition('.')[2]
+        return None
+
+    def lookup(self, url):
+        """Score delta for url's domain, or None if no entry covers it."""
+        if not url:
+            return None
+        return self.score_for_host(parse_host(url))
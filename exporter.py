@@ -0,0 +1,215 @@
+"""
+Streaming export of content_log / spikes to CSV, JSONL or Parquet.
+Rows are read through one cursor in EXPORT_CHUNK_ROWS batches and written as they
+arrive, so memory stays at about one chunk whatever the date range.
+Filters are the dashboard's (dashboard_queries.where_clause), plus an end time.
+Ranges older than the hot table also read the monthly archives (retention.py),
+attached one at a time, oldest first.
+
+    python -m exporter --since 2026-10-01 --format parquet -o october.parquet
+    python -m exporter --table spikes --hours 24 -o spikes.csv
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import db
+import dashboard_queries as dq
+import retention
+import search_index
+from config import DASHBOARD_DB, EXPORT_CHUNK_ROWS
+
+EXPORT_TABLES = ("content_log", "spikes")
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "jsonl": ("jsonl", "application/x-ndjson"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    """Formats usable here; Parquet needs pyarrow."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or importlib.util.find_spec("pyarrow")]
+
+
+def export_query(table, since=0, until=None, verdicts=(), platforms=(), min_risk=0.0, search=None,
+                 schema="main", select="*"):
+    """
+    SELECT for one table and filter set, oldest first. spikes only filter on time and platform.
+    schema names the database to read (e.g. an attached archive), search index included.
+    """
+    if table == "content_log":
+        where, params = dq.where_clause(since, verdicts, platforms, min_risk, search, fts_schemas=(schema,))
+    elif table == "spikes":
+        where, params = dq.where_clause(since, platforms=platforms)
+    else:
+        raise ValueError(f"Unknown table: {table}")
+    if until is not None:
+        where += " AND ts < ?"
+        params.append(until)
+    return f"SELECT {select} FROM {schema}.{table} WHERE {where} ORDER BY ts, id", params
+
+
+def iter_chunks(cursor, chunk_rows):
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        yield rows
+
+
+def iter_rows(conn, table, columns, chunk_rows, **filters):
+    """Chunks from each archive the range reaches, then from the hot table."""
+    searching = table == "content_log" and search_index.fts_query(filters.get("search"))
+    for name, path in retention.partitions(conn, table, filters.get("since", 0), filters.get("until")):
+        fresh = name not in retention.attached(conn)
+        if fresh:
+            conn.execute("ATTACH DATABASE ? AS " + name, (path,))
+        try:
+            if not retention.columns(conn, table, name):
+                continue
+            if searching:
+                retention.ensure_search_index(conn, name)
+            select = retention.cold_select(conn, table, name, columns)
+            sql, params = export_query(table, schema=name, select=select, **filters)
+            yield from iter_chunks(conn.execute(sql, params), chunk_rows)
+        finally:
+            if fresh:
+                conn.execute("DETACH DATABASE " + name)
+    sql, params = export_query(table, select=", ".join(columns), **filters)
+    yield from iter_chunks(conn.execute(sql, params), chunk_rows)
+
+
+def _write_csv(path, columns, chunks):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def _write_jsonl(path, columns, chunks):
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in chunks:
+            f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def _arrow_schema(conn, table, columns):
+    """Fixed schema from the declared column types, so an all-NULL chunk can't change it."""
+    import pyarrow as pa
+
+    declared = {name: (decl or "").upper() for _, name, decl, *_ in conn.execute(f"PRAGMA table_info({table})")}
+    types = {"INTEGER": pa.int64(), "REAL": pa.float64()}
+    return pa.schema([(name, types.get(declared.get(name), pa.string())) for name in columns])
+
+
+def _write_parquet(path, columns, chunks, schema):
+    # One row group per chunk
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            arrays = [
+                pa.array([_as_text(row[i]) if field.type == pa.string() else row[i] for row in rows], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def _as_text(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def export(conn, path, fmt="csv", table="content_log", chunk_rows=None, **filters):
+    """
+    Write every row of table matching filters (see export_query) to path.
+    Returns the number of rows written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    columns = retention.columns(conn, table)
+
+    written = 0
+
+    def counted(chunks):
+        nonlocal written
+        for rows in chunks:
+            written += len(rows)
+            yield rows
+
+    chunks = counted(iter_rows(conn, table, columns, chunk_rows or EXPORT_CHUNK_ROWS, **filters))
+    if fmt == "csv":
+        _write_csv(path, columns, chunks)
+    elif fmt == "jsonl":
+        _write_jsonl(path, columns, chunks)
+    else:
+        _write_parquet(path, columns, chunks, _arrow_schema(conn, table, columns))
+    return written
+
+
+def export_to_tempfile(conn, fmt="csv", table="content_log", **filters):
+    """Export into a new temporary file (caller removes it). Returns (path, rows)."""
+    fd, path = tempfile.mkstemp(prefix=f"iiccc_{table}_", suffix="." + EXPORT_FORMATS[fmt][0])
+    os.close(fd)
+    try:
+        return path, export(conn, path, fmt, table, **filters)
+    except Exception:
+        os.remove(path)
+        raise
+
+
+def _parse_time(value):
+    """ISO date/datetime or epoch seconds -> epoch seconds. Naive times are UTC, like ts."""
+    try:
+        return int(float(value))
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream content_log or spikes to CSV / JSONL / Parquet")
+    parser.add_argument("-o", "--output", help="output file (default: <table>_<date>.<format>)")
+    parser.add_argument("--db", default=DASHBOARD_DB)
+    parser.add_argument("--table", choices=EXPORT_TABLES, default="content_log")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="default: from --output's extension, else csv")
+    parser.add_argument("--since", type=_parse_time, help="start (ISO date/time in UTC, or epoch seconds)")
+    parser.add_argument("--until", type=_parse_time, help="end, exclusive")
+    parser.add_argument("--hours", type=float, help="last N hours (instead of --since)")
+    parser.add_argument("--verdict", action="append", default=[], help="repeatable")
+    parser.add_argument("--platform", action="append", default=[], help="repeatable")
+    parser.add_argument("--min-risk", type=float, default=0.0, help="0.0 - 1.0")
+    parser.add_argument("--search", help="full-text search (content_log only)")
+    parser.add_argument("--chunk", type=int, default=EXPORT_CHUNK_ROWS, help="rows per fetch / row group")
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None and args.output:
+        fmt = os.path.splitext(args.output)[1].lstrip(".").lower()
+        fmt = fmt if fmt in EXPORT_FORMATS else None
+    fmt = fmt or "csv"
+    output = args.output or f"{args.table}_{time.strftime('%Y%m%d')}.{EXPORT_FORMATS[fmt][0]}"
+    since = dq.cutoff(args.hours) if args.hours else (args.since or 0)
+
+    conn = db.connect(args.db)
+    db.init_schema(conn)
+    started = time.time()
+    rows = export(
+        conn, output, fmt, args.table, chunk_rows=args.chunk,
+        since=since, until=args.until, verdicts=tuple(args.verdict), platforms=tuple(args.platform),
+        min_risk=args.min_risk, search=args.search,
+    )
+    conn.close()
+    print(f"Exported {rows} rows to {output} in {time.time() - started:.1f}s")
@@ -0,0 +1,112 @@
+"""
+Persistent cache for Google Fact Check lookups, keyed on the derived query string.
+Hits, misses ("no claims") and errors get separate TTLs, and concurrent lookups
+of the same query wait for the first one instead of repeating the request.
+"""
+
+import sqlite3
+import threading
+import time
+
+from config import (
+    FACTCHECK_HIT_TTL_HOURS,
+    FACTCHECK_MISS_TTL_HOURS,
+    FACTCHECK_ERROR_TTL_MINUTES,
+)
+
+class FactCheckCache:
+    """SQLite-backed cache of (status, corroboration score) per fact-check query."""
+
+    # Outcome of one Fact Check API query
+    HIT, MISS, ERROR = "hit", "miss", "error"
+
+    def __init__(self, db_name="fake_news.db"):
+        self.db_name = db_name
+        self.ttls = {
+            self.HIT: FACTCHECK_HIT_TTL_HOURS * 3600,
+            self.MISS: FACTCHECK_MISS_TTL_HOURS * 3600,
+            self.ERROR: FACTCHECK_ERROR_TTL_MINUTES * 60,
+        }
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._init_table()
+
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _init_table(self):
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS factcheck_cache (
+                    query TEXT PRIMARY KEY,
+                    status TEXT,
+                    score REAL,
+                    checked_at REAL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get(self, query):
+        conn = self._get_conn()
+        try:
+            row = conn.execute(
+                "SELECT status, score, checked_at FROM factcheck_cache WHERE query=?", (query,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row and time.time() - row[2] < self.ttls.get(row[0], 0):
+            return row[0], row[1]
+        return None
+
+    def _put(self, query, status, score):
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO factcheck_cache (query, status, score, checked_at) VALUES (?, ?, ?, ?)",
+                (query, status, score, time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def lookup(self, query, fetch):
+        """
+        Return the corroboration score for query (None if no usable rating).
+        fetch(query) -> (status, score) is only called when nothing valid is cached.
+        """
+        while True:
+            cached = self._get(query)
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return cached[1]
+            with self._lock:
+                waiter = self._in_flight.get(query)
+                if waiter is None:
+                    self._in_flight[query] = threading.Event()
+                    self.cache_misses += 1
+                    break
+            # Another worker is fetching this query; reuse its result
+            waiter.wait()
+
+        try:
+            status, score = fetch(query)
+            self._put(query, status, score)
+            return score
+        finally:
+            with self._lock:
+                self._in_flight.pop(query).set()
+
+    def log_stats(self, logger):
+        with self._lock:
+            hits, misses = self.cache_hits, self.cache_misses
+        total = hits + misses
+        if total:
+            logger.info(f"Fact-check cache: {hits} hits, {misses} misses ({hits / total:.0%} hit rate)")
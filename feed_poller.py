@@ -0,0 +1,144 @@
+"""
+Conditional, adaptive feed polling.
+Keeps each feed's ETag / Last-Modified validators (and a body hash for servers
+without them) in SQLite, so an unchanged feed costs a 304 and no parsing.
+Each feed's poll interval shrinks when it changes and grows when it does not.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from config import (
+    SCAN_INTERVAL_SECONDS,
+    FEED_MIN_INTERVAL_SECONDS,
+    FEED_MAX_INTERVAL_SECONDS,
+    FEED_BACKOFF_FACTOR,
+)
+from http_client import parse_feed
+
+
+class FeedPoller:
+    """Poll feeds with If-None-Match / If-Modified-Since and per-feed intervals."""
+
+    def __init__(self, http, db_name="fake_news.db", logger=None):
+        self.http = http
+        self.db_name = db_name
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._state = {}
+        self._init_table()
+        self._load()
+
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _init_table(self):
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    interval REAL,
+                    next_poll REAL,
+                    last_changed REAL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load(self):
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                "SELECT url, etag, last_modified, content_hash, interval, next_poll, last_changed FROM feed_state"
+            ).fetchall()
+        finally:
+            conn.close()
+        for url, etag, last_modified, content_hash, interval, next_poll, last_changed in rows:
+            self._state[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "interval": interval,
+                "next_poll": next_poll,
+                "last_changed": last_changed,
+            }
+
+    def _save(self, url, state):
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO feed_state
+                    (url, etag, last_modified, content_hash, interval, next_poll, last_changed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, state["etag"], state["last_modified"], state["content_hash"],
+                  state["interval"], state["next_poll"], state["last_changed"]))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_state(self, url):
+        with self._lock:
+            return dict(self._state.get(url) or {
+                "etag": None,
+                "last_modified": None,
+                "content_hash": None,
+                "interval": float(SCAN_INTERVAL_SECONDS),
+                "next_poll": 0.0,
+                "last_changed": None,
+            })
+
+    def is_due(self, url):
+        return time.time() >= self._get_state(url)["next_poll"]
+
+    def poll(self, url, force=False):
+        """
+        Return the parsed feed if it changed since the last poll.
+        Returns None when the feed is not due yet, answered 304, or has an identical body.
+        """
+        state = self._get_state(url)
+        now = time.time()
+        if not force and now < state["next_poll"]:
+            return None
+
+        headers = {}
+        if state["etag"]:
+            headers["If-None-Match"] = state["etag"]
+        if state["last_modified"]:
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        response = self.http.get(url, headers=headers)
+        feed = None
+        if response.status_code == 304:
+            changed = False
+        else:
+            response.raise_for_status()
+            content_hash = hashlib.sha1(response.content).hexdigest()
+            changed = content_hash != state["content_hash"]
+            state["etag"] = response.headers.get("ETag")
+            state["last_modified"] = response.headers.get("Last-Modified")
+            state["content_hash"] = content_hash
+            if changed:
+                feed = parse_feed(response)
+
+        if changed:
+            state["interval"] = max(state["interval"] / FEED_BACKOFF_FACTOR, FEED_MIN_INTERVAL_SECONDS)
+            state["last_changed"] = now
+        else:
+            state["interval"] = min(state["interval"] * FEED_BACKOFF_FACTOR, FEED_MAX_INTERVAL_SECONDS)
+            if self.logger:
+                self.logger.info(f"Feed unchanged, next poll in {state['interval']:.0f}s: {url[:80]}")
+        state["next_poll"] = now + state["interval"]
+
+        with self._lock:
+            self._state[url] = state
+        self._save(url, state)
+        return feed
@@ -0,0 +1,116 @@
+"""
+Shared HTTP client for every scanner - pooled keep-alive connections per host,
+default timeouts, jittered retries and optional HTTP/2.
+"""
+
+import random
+import threading
+import time
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_SECONDS,
+    HTTP_POOL_HOSTS,
+    HTTP_POOL_SIZE_PER_HOST,
+    HTTP_ENABLE_HTTP2,
+    HTTP_USER_AGENT,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Never sleep longer than this between retries, whatever Retry-After says
+MAX_RETRY_SLEEP_SECONDS = 30
+
+
+class HttpClient:
+    """GET-only client wrapping one pooled requests.Session (or httpx.Client for HTTP/2)."""
+
+    def __init__(self, timeout=None, retries=None, backoff=None, http2=None):
+        self.timeout = timeout or HTTP_TIMEOUT_SECONDS
+        self.retries = HTTP_RETRIES if retries is None else retries
+        self.backoff = HTTP_BACKOFF_SECONDS if backoff is None else backoff
+        http2 = HTTP_ENABLE_HTTP2 if http2 is None else http2
+        self._session = None
+        if http2:
+            self._session = self._make_httpx_client()
+        if self._session is None:
+            self._session = self._make_requests_session()
+            self._transport_errors = (requests.ConnectionError, requests.Timeout)
+
+    def _make_requests_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE_PER_HOST)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = HTTP_USER_AGENT
+        return session
+
+    def _make_httpx_client(self):
+        try:
+            import httpx
+            import h2  # noqa: F401 - httpx needs it for http2=True
+        except ImportError:
+            return None
+        self._transport_errors = (httpx.TransportError,)
+        return httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            headers={"User-Agent": HTTP_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_HOSTS * HTTP_POOL_SIZE_PER_HOST,
+                max_keepalive_connections=HTTP_POOL_HOSTS * HTTP_POOL_SIZE_PER_HOST,
+            ),
+        )
+
+    def _sleep_before_retry(self, attempt, response=None):
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        time.sleep(min(delay, MAX_RETRY_SLEEP_SECONDS))
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """GET with the default timeout; retries transport errors, 429 and 5xx."""
+        for attempt in range(self.retries + 1):
+            last_try = attempt == self.retries
+            try:
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=timeout or self.timeout
+                )
+            except self._transport_errors:
+                if last_try:
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+            if response.status_code in RETRY_STATUSES and not last_try:
+                self._sleep_before_retry(attempt, response)
+                continue
+            return response
+
+
+def parse_feed(response):
+    """Parse a downloaded feed response with feedparser."""
+    return feedparser.parse(
+        response.content,
+        response_headers={
+            "content-location": str(response.url),
+            "content-type": response.headers.get("Content-Type", ""),
+        },
+    )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared HttpClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,148 @@
+"""
+Aho-Corasick multi-pattern keyword matcher (English + Devanagari).
+All keywords are compiled into one automaton, so a single pass over the text
+finds every match with its categories, instead of one substring search per keyword.
+"""
+
+import unicodedata
+from collections import deque
+
+
+# Inflections a whole-word English keyword may carry: "riot" matches "riots", "scam" "scammers"
+ASCII_SUFFIXES = ("s", "es", "ed", "ing", "er", "ers")
+
+
+def _is_word_char(ch):
+    # Combining marks count as word characters so Indic vowel signs don't end a word
+    return ch.isalnum() or ch == '_' or unicodedata.category(ch)[0] == 'M'
+
+
+def _word_at(text, start):
+    """The whole word beginning at text[start]."""
+    end = start
+    while end < len(text) and _is_word_char(text[end]):
+        end += 1
+    return text[start:end]
+
+
+def _ends_word(text, end, key):
+    """True if an English keyword match ending just before text[end] ends a word, up to an allowed suffix."""
+    if end >= len(text) or not _is_word_char(text[end]):
+        return True
+    starts = [end]
+    if text[end] == key[-1]:
+        starts.append(end + 1)  # doubled final consonant: scammed, scamming
+    for start in starts:
+        for suffix in ASCII_SUFFIXES:
+            after = start + len(suffix)
+            if text.startswith(suffix, start) and (after >= len(text) or not _is_word_char(text[after])):
+                return True
+    return False
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive automaton mapping keywords to categories.
+    Call add() for every keyword, then build() once; match() is then read-only
+    and safe to share between threads.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        # Per state: list of (keyword, length, categories, word_boundary)
+        self._out = [[]]
+        self._patterns = {}
+        # keyword -> words it must not match inside (आग in आगे)
+        self._excluded = {}
+        self._built = False
+
+    def add(self, keyword, category, word_boundary=None):
+        """
+        Register keyword under category (a keyword may have several categories).
+        With word_boundary (the default) a match must start a word, so "ai" does not
+        match "said". English keywords must also end one, up to an inflection suffix
+        ("riots", "scammers"); other scripts keep their derived forms (भ्रष्टाचार,
+        आतंकवादी), minus words listed with exclude(). word_boundary=False matches any
+        substring.
+        """
+        key = keyword.lower()
+        if word_boundary is None:
+            word_boundary = True
+        entry = self._patterns.setdefault(key, {"categories": set(), "word_boundary": word_boundary})
+        entry["categories"].add(category)
+        self._built = False
+
+    def add_all(self, keywords, category, word_boundary=None):
+        for keyword in keywords:
+            self.add(keyword, category, word_boundary)
+        return self
+
+    def exclude(self, keyword, words):
+        """Never match keyword as the start of any of words (e.g. आग in आगे)."""
+        self._excluded.setdefault(keyword.lower(), set()).update(word.lower() for word in words)
+        return self
+
+    def build(self):
+        """Compile the trie and failure links. Returns self."""
+        self._goto, self._fail, self._out = [{}], [0], [[]]
+        for key, entry in self._patterns.items():
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((key, len(key), frozenset(entry["categories"]), entry["word_boundary"]))
+
+        # Depth-1 states fail back to the root; deeper ones follow the parent's failure chain
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def find(self, text):
+        """Return {keyword: categories} for every keyword occurring in text."""
+        if not self._built:
+            self.build()
+        text = (text or '').lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for key, length, categories, word_boundary in out[state]:
+                if key in found:
+                    continue
+                if word_boundary:
+                    start = i - length + 1
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if key.isascii() and not _ends_word(text, i + 1, key):
+                        continue
+                    if key in self._excluded and _word_at(text, start) in self._excluded[key]:
+                        continue
+                found[key] = categories
+        return found
+
+    def match(self, text):
+        """Return {category: set of keywords} for text."""
+        by_category = {}
+        for key, categories in self.find(text).items():
+            for category in categories:
+                by_category.setdefault(category, set()).add(key)
+        return by_category
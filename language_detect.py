@@ -0,0 +1,150 @@
+"""
+Tiered language detection for headlines.
+1. Script fast path: Indic scripts each have their own Unicode block, so a headline
+   written mostly in one of them is identified without any model.
+2. Statistical model (langdetect, seeded for deterministic results) only for
+   Latin-script or mixed text.
+Results are memoized on the normalized title, but the tiers see the original (NFKC)
+text: langdetect misreads short casefolded, punctuation-free English as e.g. Polish.
+Each tier is counted and timed.
+"""
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from langdetect import DetectorFactory, LangDetectException, detect
+from langdetect.detector_factory import init_factory
+
+from config import LANG_SCRIPT_SHARE, LANG_CACHE_SIZE
+from utils import normalize_title
+
+# langdetect samples randomly unless seeded
+DetectorFactory.seed = 0
+# Load the profiles now: detect() loads them lazily but publishes the factory first,
+# so a concurrent enrich worker could see it empty, fail, and cache 'English'
+init_factory()
+
+# langdetect codes -> names stored in content_log.language
+LANG_MAP = {
+    'hi': 'Hindi',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'bn': 'Bengali',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi',
+    'en': 'English',
+}
+
+# The Indic blocks are consecutive 128-code-point blocks from U+0900 to U+0D7F.
+# Devanagari is reported as Hindi (Marathi/Nepali share the script).
+INDIC_BLOCK_START = 0x0900
+INDIC_BLOCKS = ['Hindi', 'Bengali', 'Punjabi', 'Gujarati', 'Odia', 'Tamil', 'Telugu', 'Kannada', 'Malayalam']
+INDIC_BLOCK_END = INDIC_BLOCK_START + 128 * len(INDIC_BLOCKS)
+
+DEFAULT_LANGUAGE = 'English'
+TIERS = ('script', 'model', 'cache')
+
+
+def script_language(text):
+    """Language of the Indic script covering LANG_SCRIPT_SHARE of the letters, else None."""
+    counts = {}
+    letters = 0
+    for ch in text:
+        cp = ord(ch)
+        if INDIC_BLOCK_START <= cp < INDIC_BLOCK_END:
+            # Vowel signs and viramas count with their block
+            block = INDIC_BLOCKS[(cp - INDIC_BLOCK_START) >> 7]
+            counts[block] = counts.get(block, 0) + 1
+            letters += 1
+        elif ch.isalpha():
+            letters += 1
+    if not counts:
+        return None
+    language, count = max(counts.items(), key=lambda kv: kv[1])
+    return language if count >= LANG_SCRIPT_SHARE * letters else None
+
+
+class LanguageDetector:
+    """Script fast path, then langdetect, behind an LRU keyed on normalized titles."""
+
+    def __init__(self, cache_size=None):
+        self._lock = threading.Lock()
+        # Cache hits are derived: every call minus the ones that reached a tier
+        self.calls = 0
+        self.call_seconds = 0.0
+        self.counts = dict.fromkeys(TIERS[:2], 0)
+        self.seconds = dict.fromkeys(TIERS[:2], 0.0)
+        self.cache_size = cache_size or LANG_CACHE_SIZE
+        self._cache = OrderedDict()
+
+    def _record(self, tier, elapsed):
+        with self._lock:
+            self.counts[tier] += 1
+            self.seconds[tier] += elapsed
+
+    def _detect_uncached(self, text):
+        start = time.perf_counter()
+        language = script_language(text)
+        if language is not None:
+            self._record('script', time.perf_counter() - start)
+            return language
+        try:
+            language = detect(text)
+            language = LANG_MAP.get(language, language)
+        except LangDetectException:
+            language = DEFAULT_LANGUAGE
+        self._record('model', time.perf_counter() - start)
+        return language
+
+    def detect(self, text):
+        """Language name for text ('English' when undetectable)."""
+        start = time.perf_counter()
+        text = unicodedata.normalize('NFKC', text or '').strip()
+        key = normalize_title(text)
+        with self._lock:
+            language = self._cache.get(key)
+            if language is not None:
+                self._cache.move_to_end(key)
+        if language is None:
+            language = self._detect_uncached(text) if key else DEFAULT_LANGUAGE
+            with self._lock:
+                self._cache[key] = language
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.call_seconds += elapsed
+        return language
+
+    def stats(self):
+        """Per tier: items handled and items/sec spent in that tier."""
+        with self._lock:
+            counts = dict(self.counts, cache=self.calls - sum(self.counts.values()))
+            seconds = dict(self.seconds, cache=max(self.call_seconds - sum(self.seconds.values()), 0.0))
+        return {
+            tier: {
+                "count": counts[tier],
+                "per_sec": counts[tier] / seconds[tier] if seconds[tier] else 0.0,
+            }
+            for tier in TIERS
+        }
+
+    def log_stats(self, logger):
+        s = self.stats()
+        if any(tier["count"] for tier in s.values()):
+            logger.info("Language detection: " + ", ".join(
+                f"{name} {tier['count']} ({tier['per_sec']:.0f}/s)" for name, tier in s.items()
+            ))
+
+
+detector = LanguageDetector()
+
+
+def detect_language(text):
+    return detector.detect(text)
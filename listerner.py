@@ -1,52 +1,68 @@
-import sqlite3
 import time
 import random
-import requests
 import re
 import json
-import feedparser
+import sqlite3
 from datetime import datetime, timezone
 from groq import Groq
 import os
 import random
 from googleapiclient.discovery import build
 
+import db
 from utils import setup_logging
 from risk_scoring import RiskScorer
 from spike_tracker import SpikeTracker
+from scan_engine import ScanEngine
+from pipeline import IngestPipeline, RateLimiter
+from seen_index import SeenUrlIndex
+from verdict_cache import VerdictCache
+from factcheck_cache import FactCheckCache
+from http_client import get_client
+from feed_poller import FeedPoller
+from language_detect import detect_language, detector as language_detector
+from story_clusters import StoryIndex
+from retention import Retention
 from config import (
     NEWS_API_KEY, YOUTUBE_API_KEY, GROQ_API_KEY, GOOGLE_FACTCHECK_API_KEY,
     MODEL_NAME, TRENDS_RSS_URL, RSS_FEEDS, RSS_VIEW_ESTIMATES,
     HN_TOP_STORIES, HN_ITEM_URL, NEWS_API_QUERIES,
-    RISK_KEYWORDS, TECH_RISK_KEYWORDS,
+    RISK_KEYWORDS,
     SPIKE_VD_THRESHOLD, SPIKE_VIEWS_THRESHOLD, YOUTUBE_VD_MIN, YOUTUBE_VIEWS_MIN,
     NEWS_API_ARTICLE_LIMIT, RSS_ENTRIES_PER_FEED, YOUTUBE_SEARCH_LIMIT,
-    SCAN_INTERVAL_SECONDS,
+    SCAN_INTERVAL_SECONDS, PIPELINE_STAGES, LLM_REQUESTS_PER_MINUTE, LLM_BATCH_SIZE,
+    FACTCHECK_TIMEOUT_SECONDS, SCHEDULER_TICK_SECONDS, STORY_SPREAD_PLATFORMS,
 )
 from dotenv import load_dotenv
 load_dotenv('keys.env')
-from langdetect import detect, LangDetectException
-
-def detect_language(text):
-    """Detect language of text, default to 'en' if detection fails"""
-    try:
-        lang = detect(text)
-        # Map common Indian language codes
-        lang_map = {
-            'hi': 'Hindi',
-            'ta': 'Tamil',
-            'te': 'Telugu',
-            'bn': 'Bengali',
-            'mr': 'Marathi',
-            'gu': 'Gujarati',
-            'kn': 'Kannada',
-            'ml': 'Malayalam',
-            'pa': 'Punjabi',
-            'en': 'English',
-        }
-        return lang_map.get(lang, lang)
-    except LangDetectException:
-        return 'English'  # Default to English if detection fails
+
+CLASSIFY_RULES = """
+    Analyze the headline and classify it into ONE of these categories.
+    Be specific. Do not just say "Clickbait" if it is actually a Scam or Political.
+
+    CATEGORIES & RULES:
+    1. DEEPFAKE: Mentions "leaked audio", "AI video", or impossible behavior by public figures.
+    2. SCAM: Mentions "free money", "crypto giveaway", "urgent investment", or "hack trick".
+    3. POLITICAL BIAS: Highly opinionated, attacking a party, or using charged words like "destroy", "traitor".
+    4. MISLEADING: Factually doubtful, missing context, or cherry-picked facts.
+    5. CLICKBAIT: Exaggerated ("You won't believe", "Shocking") but harmless.
+    6. SATIRE: clearly a joke or meme.
+    7. LIKELY REAL: Neutral news reporting (e.g., "Sensex down 200 points").
+"""
+
+CLASSIFY_PROMPT = CLASSIFY_RULES + """
+    Output strictly valid JSON:
+    {"score": 0-100, "category": "CATEGORY_NAME", "reason": "short explanation"}
+    (Score 100 = Dangerous/Fake, Score 0 = Safe/Real)
+    """
+
+BATCH_CLASSIFY_PROMPT = CLASSIFY_RULES + """
+    You will receive a numbered list of headlines. Classify EACH one independently.
+
+    Output strictly valid JSON with one entry per headline, using its number as "id":
+    {"results": [{"id": 1, "score": 0-100, "category": "CATEGORY_NAME", "reason": "short explanation"}, ...]}
+    (Score 100 = Dangerous/Fake, Score 0 = Safe/Real)
+    """
 
 # Validate API keys
 print("ing API keys...")
@@ -62,14 +78,25 @@ print("Keys OK\n")
 class SocialListener:
     def __init__(self):
         self.logger = setup_logging()
+        self.http = get_client()
         self.logger.info(f" INITIALIZING: Advanced Classification Engine ({MODEL_NAME})")
         self.client = Groq(api_key=GROQ_API_KEY)
         self.risk_scorer = RiskScorer()
-        self.spike_tracker = SpikeTracker()
+        self.spike_tracker = SpikeTracker(match_keywords=self.risk_scorer.match_keywords)
         self.db_name = 'fake_news.db'
         self.init_db()
+        self.seen_urls = SeenUrlIndex(self.db_name)
+        self.verdict_cache = VerdictCache(self.db_name)
+        self.factcheck_cache = FactCheckCache(self.db_name)
+        self.stories = StoryIndex(self.db_name)
+        self.retention = Retention(self.db_name, self.logger)
+        self.feeds = FeedPoller(self.http, self.db_name, self.logger)
+        # Opened after every component has run its DDL: a long-lived connection opened
+        # before another connection changes the schema fails its first write
+        self.writer = db.ContentWriter(self.db_name)
         self.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
         self.init_factcheck_api()
+        self.init_pipeline()
 
     def init_factcheck_api(self):
         """Initialize Google Fact Check API."""
@@ -80,29 +107,37 @@ class SocialListener:
             self.factcheck_api_key = YOUTUBE_API_KEY
             self.logger.info("Fact Check API: Using fallback Google Cloud API key")
 
+    @staticmethod
+    def factcheck_query(text):
+        """Derive the Fact Check search query: the 2-3 longest words, in headline order."""
+        clean_text = re.sub(r'[^\w\s]', ' ', text.lower())
+        words = [w for w in clean_text.split() if len(w) > 3]
+        
+        if len(words) >= 2:
+            top_words = sorted(words, key=len, reverse=True)[:3]
+            query = " ".join([w for w in words if w in top_words])
+        elif words:
+            query = words[0]
+        else:
+            return None
+        
+        if not query or len(query) < 2:
+             return None 
+        return query
+
     def check_factcheck_api(self, text):
-        """Query Google Fact Check Tools API via HTTP and return a corroboration score."""
+        """Return a corroboration score for text, via the fact-check cache when possible."""
         if not self.factcheck_api_key:
             return None
-            
+
+        query = self.factcheck_query(text)
+        if query is None:
+            return None
+        return self.factcheck_cache.lookup(query, self.fetch_factcheck)
+
+    def fetch_factcheck(self, query):
+        """Query Google Fact Check Tools API via HTTP. Returns (status, corroboration score)."""
         try:
-            import re, requests
-            
-            # Extract 2-3 clean keywords
-            clean_text = re.sub(r'[^\w\s]', ' ', text.lower())
-            words = [w for w in clean_text.split() if len(w) > 3]
-            
-            if len(words) >= 2:
-                top_words = sorted(words, key=len, reverse=True)[:3]
-                query = " ".join([w for w in words if w in top_words])
-            elif words:
-                query = words[0]
-            else:
-                return None
-            
-            if not query or len(query) < 2:
-                 return None 
-                
             url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
             params = {
                 "query": query,
@@ -110,82 +145,48 @@ class SocialListener:
                 "key": self.factcheck_api_key
             }
             
-            # Increased timeout to 15s because the Google API can sometimes be slow
-            response = requests.get(url, params=params, timeout=15)
+            # Errors are cached briefly, so a slow API costs one timeout per query, not one per item
+            response = self.http.get(url, params=params, timeout=FACTCHECK_TIMEOUT_SECONDS)
             
             if response.status_code != 200:
                 # If 400 happens here, it's definitively an API key restrictions/permissions issue, not python client parsing
                 self.logger.warning(f"Fact Check API ({response.status_code}): {response.text[:200]}")
-                return None
+                return FactCheckCache.ERROR, None
                 
             data = response.json()
             claims = data.get('claims', [])
             if not claims:
-                return None
+                return FactCheckCache.MISS, None
                 
             top_claim = claims[0]
             claim_review = top_claim.get('claimReview', [])
             if not claim_review:
-                return None
+                return FactCheckCache.MISS, None
 
             rating = claim_review[0].get('textualRating', '').lower()
             self.logger.info(f"Fact Check Match: '{query}' -> Rating: {rating}")
             
             if 'false' in rating or 'pants on fire' in rating or 'fake' in rating:
-                return 0.0  # Debunked
+                return FactCheckCache.HIT, 0.0  # Debunked
             elif 'true' in rating or 'correct' in rating:
-                return 1.0  # Verified True
+                return FactCheckCache.HIT, 1.0  # Verified True
             elif 'unverified' in rating or 'half true' in rating or 'misleading' in rating:
-                return 0.5  # Mixed/Unverified
+                return FactCheckCache.HIT, 0.5  # Mixed/Unverified
                 
-            return None
+            return FactCheckCache.HIT, None
         except Exception as e:
             self.logger.error(f"Fact Check Search Error: {e}")
-            return None
+            return FactCheckCache.ERROR, None
 
     def init_db(self):
-        conn = sqlite3.connect(self.db_name, timeout=10)
-        conn.execute('PRAGMA journal_mode=WAL')
-        conn.execute('PRAGMA busy_timeout=5000')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS content_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                platform TEXT,
-                title TEXT,
-                url TEXT UNIQUE,
-                image_url TEXT,
-                views INTEGER,
-                tags TEXT,
-                panic_score REAL,
-                verdict TEXT,
-                virality_vd REAL,
-                ai_explanation TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Add ai_explanation column if DB existed before
-        try:
-            cursor.execute("ALTER TABLE content_log ADD COLUMN ai_explanation TEXT")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute("ALTER TABLE content_log ADD COLUMN language TEXT DEFAULT 'en'")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-
+        conn = db.connect(self.db_name)
         try:
-            cursor.execute("ALTER TABLE content_log ADD COLUMN corroboration_score REAL")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass            
-        conn.close()
+            db.init_schema(conn)
+        finally:
+            conn.close()
 
-    def ask_ai(self, text):
-        
+    def _complete_json(self, system_prompt, user_content):
+        """Send one JSON-mode chat completion, trying each provider. Returns parsed JSON or None."""
         # List of providers to try
         providers = [
             {
@@ -199,30 +200,13 @@ class SocialListener:
         # Shuffle to distribute load
         random.shuffle(providers)
         
-        system_prompt = """
-    Analyze the headline and classify it into ONE of these categories.
-    Be specific. Do not just say "Clickbait" if it is actually a Scam or Political.
-
-    CATEGORIES & RULES:
-    1. DEEPFAKE: Mentions "leaked audio", "AI video", or impossible behavior by public figures.
-    2. SCAM: Mentions "free money", "crypto giveaway", "urgent investment", or "hack trick".
-    3. POLITICAL BIAS: Highly opinionated, attacking a party, or using charged words like "destroy", "traitor".
-    4. MISLEADING: Factually doubtful, missing context, or cherry-picked facts.
-    5. CLICKBAIT: Exaggerated ("You won't believe", "Shocking") but harmless.
-    6. SATIRE: clearly a joke or meme.
-    7. LIKELY REAL: Neutral news reporting (e.g., "Sensex down 200 points").
-
-    Output strictly valid JSON:
-    {"score": 0-100, "category": "CATEGORY_NAME", "reason": "short explanation"}
-    (Score 100 = Dangerous/Fake, Score 0 = Safe/Real)
-    """
-        
         for provider in providers:
-            try:                
+            try:
+                self.llm_limiter.wait()
                 completion = provider['client'].chat.completions.create(
                     messages=[
                         {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"Classify this: '{text}'"}
+                        {"role": "user", "content": user_content}
                     ],
                     model=provider['model'],
                     response_format={"type": "json_object"},
@@ -231,11 +215,7 @@ class SocialListener:
                 
                 data = json.loads(completion.choices[0].message.content)
                 self.logger.info(f"✅ {provider['name'].upper()} success")
-                return {
-                    "verdict": data.get("category", "UNVERIFIED").upper(),
-                    "risk": data.get("score", 0) / 100,
-                    "reason": data.get("reason", "No explanation")[:500]
-                }
+                return data
                 
             except Exception as e:
                 error_msg = str(e).lower()
@@ -248,163 +228,306 @@ class SocialListener:
         
         # All providers failed
         self.logger.error("🚨 ALL AI PROVIDERS FAILED")
-        return {"verdict": "ERROR", "risk": 0, "reason": "AI unavailable"}
+        return None
+
+    @staticmethod
+    def _parse_analysis(data):
+        return {
+            "verdict": str(data.get("category", "UNVERIFIED")).upper(),
+            "risk": float(data.get("score", 0)) / 100,
+            "reason": str(data.get("reason", "No explanation"))[:500]
+        }
+
+    def ask_ai(self, text, use_cache=True):
+        if use_cache:
+            cached = self.verdict_cache.get(text)
+            if cached:
+                return cached
 
-    def save_to_db(self, data):
-        conn = sqlite3.connect(self.db_name, timeout=10)
-        cursor = conn.cursor()
+        data = self._complete_json(CLASSIFY_PROMPT, f"Classify this: '{text}'")
         try:
-            cursor.execute("SELECT id FROM content_log WHERE url=?", (data['url'],))
-            if cursor.fetchone(): 
-                return
-
-            # ⭐ FIXED: Added 'language' and 'corroboration_score' to the SQL query
-            cursor.execute('''
-                INSERT INTO content_log (platform, title, url, image_url, views, tags, panic_score, verdict, virality_vd, ai_explanation, language, corroboration_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                data['platform'], 
-                data['title'], 
-                data['url'], 
-                data.get('image_url'), 
-                data['views'], 
-                data['tags'], 
-                data['risk'], 
-                data['verdict'], 
-                data['vd'], 
-                data.get('ai_explanation', ''),
-                data.get('language', 'English'),
-                data.get('corroboration_score')
-            ))
-            conn.commit()
-            self.logger.info(f"SAVED [{data['verdict']}]: {data['title'][:30]}...")
-            
-            # Check volume spike (platform getting more items than usual)
-            is_vol_spike, recent_rate, baseline = self.spike_tracker.is_spike(data['platform'])
-            if is_vol_spike:
-                self.logger.warning(f"VOLUME SPIKE: {data['platform']} | rate={recent_rate:.1f}/hr vs baseline={baseline:.1f}/hr")
-                self.spike_tracker.log_spike(data['platform'], data['title'], recent_rate, baseline)
+            analysis = self._parse_analysis(data)
+        except Exception as e:
+            if data is not None:
+                self.logger.error(f"❌ Unparseable AI response: {e}")
+            return {"verdict": "ERROR", "risk": 0, "reason": "AI unavailable"}
+        self.verdict_cache.put(text, analysis)
+        return analysis
+
+    def ask_ai_batch(self, texts):
+        """
+        Classify many headlines with as few requests as possible.
+        Returns one analysis per text, in order. Cached titles never reach the LLM.
+        """
+        results = [self.verdict_cache.get(text) for text in texts]
+        pending = [i for i, r in enumerate(results) if r is None]
+        for start in range(0, len(pending), LLM_BATCH_SIZE):
+            chunk = pending[start:start + LLM_BATCH_SIZE]
+            analyses = self._classify_chunk([texts[i] for i in chunk])
+            for i, analysis in zip(chunk, analyses):
+                results[i] = analysis
+        return results
+
+    def _classify_chunk(self, texts):
+        """One batch request; a failed request is split in half, unparsed items go single."""
+        if len(texts) == 1:
+            return [self.ask_ai(texts[0], use_cache=False)]
+
+        listing = "\n".join(f"{n}. {text}" for n, text in enumerate(texts, 1))
+        data = self._complete_json(BATCH_CLASSIFY_PROMPT, f"Classify these headlines:\n{listing}")
+        if data is None:
+            mid = len(texts) // 2
+            self.logger.warning(f"Batch of {len(texts)} failed, splitting")
+            return self._classify_chunk(texts[:mid]) + self._classify_chunk(texts[mid:])
+
+        by_id = {}
+        for entry in data.get("results", []) if isinstance(data, dict) else []:
+            try:
+                by_id[int(entry["id"])] = self._parse_analysis(entry)
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        analyses = []
+        fallbacks = 0
+        for n, text in enumerate(texts, 1):
+            analysis = by_id.get(n)
+            if analysis is None:
+                fallbacks += 1
+                analysis = self.ask_ai(text, use_cache=False)
+            else:
+                self.verdict_cache.put(text, analysis)
+            analyses.append(analysis)
+        self.logger.info(f"Batch classified {len(texts)} headlines in one request ({fallbacks} single fallbacks)")
+        return analyses
+
+    def save_items(self, items):
+        """Persist stage: write a batch in one transaction, then run spike checks per platform."""
+        try:
+            try:
+                inserted = self.writer.write_batch(items)
+            except sqlite3.OperationalError as e:
+                # Locked DB or a schema change seen late; the transaction rolled back
+                self.logger.warning(f"DB write failed ({e}), retrying batch of {len(items)}")
+                inserted = self.writer.write_batch(items)
         except Exception as e:
             self.logger.error(f"DB Error: {e}", exc_info=True)
-        finally: 
-            conn.close()
+            # Let the next poll fetch these again instead of skipping them as seen
+            for data in items:
+                self.seen_urls.forget(data['url'])
+            return [None] * len(items)
+
+        for data in inserted:
+            self.spike_tracker.record(data['platform'], data['ts'])
+            self.logger.info(f"SAVED [{data['verdict']}]: {data['title'][:30]}...")
+            # Multi-window surge per platform, verdict and keyword
+            for event in self.spike_tracker.observe(data['platform'], data['verdict'], data.get('keywords', ()), data['ts']):
+                self.logger.warning(
+                    f"SPIKE [{event['window']}] {event['series']} | rate={event['rate']:.1f}/hr "
+                    f"vs baseline={event['baseline']:.1f}/hr (z={event['z']:.1f})"
+                )
+                # Verdict / keyword series span platforms: only platform series get one
+                dimension, _, value = event['series'].partition(':')
+                self.spike_tracker.log_spike(
+                    value if dimension == 'platform' else None, data['title'], event['rate'], event['baseline'],
+                    window=event['window'], series=event['series'],
+                )
+
+        # Same story showing up on several platforms
+        for story_id, platform_counts in self.stories.add_members(inserted).items():
+            if len(platform_counts) >= STORY_SPREAD_PLATFORMS:
+                title = next(d['title'] for d in inserted if d.get('story_id') == story_id)
+                self.logger.warning(
+                    f"CROSS-PLATFORM STORY #{story_id} on {len(platform_counts)} platforms "
+                    f"({', '.join(sorted(platform_counts))}): {title[:50]}"
+                )
+
+        # Check volume spike (platform getting more items than usual)
+        for platform in {data['platform'] for data in inserted}:
+            is_vol_spike, recent_rate, baseline = self.spike_tracker.is_spike(platform)
+            if is_vol_spike:
+                title = next(d['title'] for d in reversed(inserted) if d['platform'] == platform)
+                self.logger.warning(f"VOLUME SPIKE: {platform} | rate={recent_rate:.1f}/hr vs baseline={baseline:.1f}/hr")
+                self.spike_tracker.log_spike(platform, title, recent_rate, baseline)
+
+        saved = {id(data) for data in inserted}
+        return [data if id(data) in saved else None for data in items]
 
     def is_virality_spike(self, views, vd_score):
         """Detect virality spike: high velocity or high total views (per PRD)"""
         return vd_score >= SPIKE_VD_THRESHOLD or views >= SPIKE_VIEWS_THRESHOLD
 
+    def init_pipeline(self):
+        """Wire process_item's steps into bounded, independently scaled stages."""
+        self.llm_limiter = RateLimiter(LLM_REQUESTS_PER_MINUTE)
+        self.pipeline = IngestPipeline(self.logger, on_error=self.forget_items)
+        for name, fn in (
+            ("enrich", self.enrich_item),
+            ("classify", self.classify_items),
+            ("score", self.score_item),
+            ("persist", self.save_items),
+        ):
+            self.pipeline.add_stage(name, fn, **PIPELINE_STAGES[name])
+        self.pipeline.start()
+
+    def forget_items(self, stage, items):
+        """A stage failed on items: unmark their URLs so the next scan fetches them again."""
+        for item in items:
+            self.seen_urls.forget(item['url'])
+        self.logger.warning(f"Pipeline: {len(items)} items lost in {stage}, will be retried next scan")
+
     def process_item(self, platform, title, url, views, tag, image_url, vd_score):
+        """
+        Queue a fetched item for enrichment. Blocks while the pipeline is saturated.
+        Returns True if the item was new and queued.
+        """
+        if self.seen_urls.check_and_add(url, platform):
+            return False
+        self.pipeline.submit({
+            "platform": platform,
+            "title": title,
+            "url": url,
+            "image_url": image_url,
+            "views": views,
+            "tags": tag,
+            "vd": vd_score,
+        })
+        return True
+
+    def enrich_item(self, item):
+        title = item['title']
         detected_lang = detect_language(title)
     
         # Log if non-English detected
         if detected_lang != 'English':
             self.logger.info(f"🌐 Detected: {detected_lang} | {title[:50]}")
-            
-        corroboration_score = self.check_factcheck_api(title)
-            
-        analysis = self.ask_ai(title)
-        if "IRRELEVANT" in analysis.get("verdict", ""): 
-            return
-        
+
+        item['language'] = detected_lang
+        item['corroboration_score'] = self.check_factcheck_api(title)
+        item['story_id'] = self.stories.assign(title)
+        return item
+
+    def classify_items(self, items):
+        # Near-duplicates of an already classified story reuse its verdict
+        analyses = [self.stories.cached_verdict(item['story_id']) for item in items]
+        pending = [i for i, analysis in enumerate(analyses) if analysis is None]
+        for i, analysis in zip(pending, self.ask_ai_batch([items[i]['title'] for i in pending])):
+            analyses[i] = analysis
+            self.stories.set_verdict(items[i]['story_id'], analysis)
+
+        classified = []
+        for item, analysis in zip(items, analyses):
+            if "IRRELEVANT" in analysis.get("verdict", ""): 
+                classified.append(None)
+                continue
+            item['verdict'] = analysis['verdict']
+            item['ai_score'] = analysis['risk']
+            item['ai_explanation'] = analysis.get("reason", "")
+            classified.append(item)
+        return classified
+
+    def score_item(self, item):
+        title, views, vd_score = item['title'], item['views'], item['vd']
         risk_analysis = self.risk_scorer.calculate_composite_risk(
             title=title,
-            platform=platform,
-            url=url,
+            platform=item['platform'],
+            url=item['url'],
             views=views,
             virality_vd=vd_score,
-            tags=tag,
-            ai_score=analysis['risk'],
-            corroboration_score=corroboration_score
+            tags=item['tags'],
+            ai_score=item['ai_score'],
+            corroboration_score=item['corroboration_score']
         )
         composite = risk_analysis['composite_risk']
         if composite > 0.7:
             self.logger.warning(f"HIGH RISK: {title[:50]} (Risk: {composite:.2f})")
         if self.is_virality_spike(views, vd_score):
             self.logger.info(f"VIRALITY SPIKE: vd={vd_score:.0f}, views={views} | {title[:40]}...")
-    
-        self.save_to_db({
-            "platform": platform, 
-            "title": title, 
-            "url": url, 
-            "image_url": image_url,
-            "views": views, 
-            "tags": tag, 
-            "risk": composite, 
-            "verdict": analysis['verdict'],
-            "vd": vd_score,
-            "ai_explanation": analysis.get("reason", ""),
-            "language": detected_lang,
-            "corroboration_score": corroboration_score
-        })
-        time.sleep(1)
-    
+        item['risk'] = composite
+        item['keywords'] = self.risk_scorer.match_keywords(title)
+        return item
 
     def scan_google_trends(self):
         self.logger.info("Google Trends Scan (India)")
+        new_items = 0
         try:
-            feed = feedparser.parse(TRENDS_RSS_URL)
+            feed = self.feeds.poll(TRENDS_RSS_URL)
+            if feed is None:
+                return None
             for entry in feed.entries[:3]:
                 traffic = int(getattr(entry, 'ht_approx_traffic', '10000').replace(',', '').replace('+', ''))
                 vd = traffic / 24.0
                 img = None
                 if 'ht_picture' in entry: 
                     img = entry.ht_picture
-                self.process_item("Google Trends", entry.title, entry.link, traffic, "viral-trend", img, vd)
+                new_items += self.process_item("Google Trends", entry.title, entry.link, traffic, "viral-trend", img, vd)
         except Exception as e: 
             self.logger.error(f"Trends Error: {e}")
+        return new_items
 
     def scan_hacker_news(self):
         self.logger.info("Hacker News Scan")
+        new_items = 0
         try:
-            top_ids = requests.get(HN_TOP_STORIES).json()[:5]
+            top_ids = self.http.get(HN_TOP_STORIES).json()[:5]
             for item_id in top_ids:
-                item = requests.get(HN_ITEM_URL.format(item_id)).json()
+                item = self.http.get(HN_ITEM_URL.format(item_id)).json()
                 if not item or 'title' not in item: 
                     continue
                 title = item['title']
-                if any(k in title.lower() for k in TECH_RISK_KEYWORDS):
+                if self.risk_scorer.match_keywords(title, 'tech'):
                     reach = (item.get('score', 0) * 100)
-                    self.process_item("Hacker News", title, item.get('url', 'https://news.ycombinator.com'), reach, "tech", None, reach/10)
+                    new_items += self.process_item("Hacker News", title, item.get('url', 'https://news.ycombinator.com'), reach, "tech", None, reach/10)
         except Exception as e: 
             self.logger.error(f"HN Error: {e}")
+        return new_items
 
     def scan_google_rss(self, tag):
         self.logger.info(f" Google News Scan: '{tag}'")
         rss_url = f"https://news.google.com/rss/search?q={tag}&hl=en-IN&gl=IN&ceid=IN:en"
+        new_items = 0
         try:
-            feed = feedparser.parse(rss_url)
+            feed = self.feeds.poll(rss_url)
+            if feed is None:
+                return None
             for entry in feed.entries[:2]:
-                self.process_item("Google News", entry.title, entry.link, 50000, tag, None, 5000)
+                new_items += self.process_item("Google News", entry.title, entry.link, 50000, tag, None, 5000)
         except Exception as e:
             self.logger.error(f"Google RSS Error: {e}")
+        return new_items
 
     def scan_rss_feeds(self):
-        for source_name, feed_url in RSS_FEEDS.items():
-            self.logger.info(f"RSS Feed Scan: {source_name}")
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:RSS_ENTRIES_PER_FEED]:
-                    title = entry.title
-                    url = entry.link
-                    views = RSS_VIEW_ESTIMATES.get(source_name, 50000)
-                    self.process_item(
-                        platform=source_name,
-                        title=title,
-                        url=url,
-                        views=views,
-                        tag='news',
-                        image_url=None,
-                        vd_score=views / 12
-                    )
-                    
-            except Exception as e:
-                self.logger.error(f"RSS Error ({source_name}): {e}")
+        return sum(self.scan_rss_feed(source_name, feed_url) or 0 for source_name, feed_url in RSS_FEEDS.items())
+
+    def scan_rss_feed(self, source_name, feed_url):
+        self.logger.info(f"RSS Feed Scan: {source_name}")
+        new_items = 0
+        try:
+            feed = self.feeds.poll(feed_url)
+            if feed is None:
+                return None
+            for entry in feed.entries[:RSS_ENTRIES_PER_FEED]:
+                title = entry.title
+                url = entry.link
+                views = RSS_VIEW_ESTIMATES.get(source_name, 50000)
+                new_items += self.process_item(
+                    platform=source_name,
+                    title=title,
+                    url=url,
+                    views=views,
+                    tag='news',
+                    image_url=None,
+                    vd_score=views / 12
+                )
+                
+        except Exception as e:
+            self.logger.error(f"RSS Error ({source_name}): {e}")
+        return new_items
 
     def search_youtube_free(self, query, limit=None):
         limit = limit or YOUTUBE_SEARCH_LIMIT
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(f"https://www.youtube.com/results?search_query={query}", headers=headers)
+            response = self.http.get(f"https://www.youtube.com/results?search_query={query}", headers=headers)
             video_ids = re.findall(r'"videoId":"([a-zA-Z0-9_-]{11})"', response.text)
             return list(set(video_ids))[:limit]
         except: 
@@ -414,8 +537,9 @@ class SocialListener:
         self.logger.info(f" YouTube Scan: '{tag}'")
         ids = self.search_youtube_free(f"{tag} -gaming")
         if not ids: 
-            return
+            return 0
 
+        new_items = 0
         try:
             stats = self.youtube.videos().list(id=','.join(ids), part='statistics,snippet').execute()
             for item in stats.get('items', []):
@@ -427,15 +551,17 @@ class SocialListener:
 
                 if Vd > YOUTUBE_VD_MIN or R > YOUTUBE_VIEWS_MIN:
                     img = item['snippet']['thumbnails']['medium']['url']
-                    self.process_item("YouTube", item['snippet']['title'], f"https://youtu.be/{item['id']}", R, tag, img, Vd)
+                    new_items += self.process_item("YouTube", item['snippet']['title'], f"https://youtu.be/{item['id']}", R, tag, img, Vd)
         except Exception as e: 
             self.logger.error(f"YT Error: {e}")
+        return new_items
 
     def scan_news_api(self):
         """NewsAPI.org - verified + diverse news sources (India focus)"""
         if not NEWS_API_KEY:
-            return
+            return None
         self.logger.info("News API Scan")
+        new_items = 0
         for query in NEWS_API_QUERIES[:2]:
             try:
                 url = "https://newsapi.org/v2/everything"
@@ -446,7 +572,7 @@ class SocialListener:
                     "sortBy": "publishedAt",
                     "pageSize": min(NEWS_API_ARTICLE_LIMIT, 5),
                 }
-                resp = requests.get(url, params=params, timeout=10)
+                resp = self.http.get(url, params=params)
                 data = resp.json()
                 if data.get("status") != "ok":
                     self.logger.warning(f"News API: {data.get('message', 'Unknown error')}")
@@ -459,7 +585,7 @@ class SocialListener:
                     # Rough virality: newer = higher vd
                     views = 50000
                     vd = 5000
-                    self.process_item(
+                    new_items += self.process_item(
                         platform="News API",
                         title=title,
                         url=url_link,
@@ -470,16 +596,41 @@ class SocialListener:
                     )
             except Exception as e:
                 self.logger.error(f"News API Error: {e}")
+        return new_items
+
+    def register_sources(self, engine):
+        """Register every scanner with the scan scheduler."""
+        engine.add_source("Google Trends", self.scan_google_trends)
+        engine.add_source("Hacker News", self.scan_hacker_news)
+        engine.add_source("Google News", lambda: self.scan_google_rss(random.choice(RISK_KEYWORDS)))
+        engine.add_source("YouTube", lambda: self.scan_youtube(random.choice(RISK_KEYWORDS)))
+        for source_name, feed_url in RSS_FEEDS.items():
+            engine.add_source(
+                source_name,
+                lambda name=source_name, url=feed_url: self.scan_rss_feed(name, url),
+                group="RSS",
+            )
+        engine.add_source("News API", self.scan_news_api)
+        engine.add_source("Retention", self.retention.run)
+
+    def log_stats(self):
+        self.pipeline.log_stats()
+        self.seen_urls.log_stats(self.logger)
+        self.verdict_cache.log_stats(self.logger)
+        self.factcheck_cache.log_stats(self.logger)
+        self.writer.log_stats(self.logger)
+        language_detector.log_stats(self.logger)
+        self.stories.log_stats(self.logger)
+        self.retention.log_stats(self.logger)
 
 if __name__ == "__main__":
     bot = SocialListener()
+    engine = ScanEngine(bot.logger, is_spike=lambda platform: bot.spike_tracker.is_spike(platform)[0])
+    bot.register_sources(engine)
+    last_stats = time.monotonic()
     while True:
-        tag = random.choice(RISK_KEYWORDS)
-        bot.scan_google_trends()
-        bot.scan_hacker_news()
-        bot.scan_google_rss(tag)
-        bot.scan_youtube(tag)
-        bot.scan_rss_feeds()
-        bot.scan_news_api()
-        bot.logger.info(f" Resting for {SCAN_INTERVAL_SECONDS}s...")
-        time.sleep(SCAN_INTERVAL_SECONDS)  
+        engine.tick()
+        if time.monotonic() - last_stats >= SCAN_INTERVAL_SECONDS:
+            bot.log_stats()
+            last_stats = time.monotonic()
+        time.sleep(SCHEDULER_TICK_SECONDS)
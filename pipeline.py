@@ -0,0 +1,158 @@
+"""
+Staged ingestion pipeline - fetch -> enrich -> classify -> score -> persist.
+Stages are connected by bounded queues; a full queue blocks the stage before it,
+so backpressure reaches the fetchers instead of piling up LLM calls.
+"""
+
+import queue
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls evenly to stay under N calls per minute."""
+
+    def __init__(self, calls_per_minute):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may make its next call."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Stage:
+    """
+    One pipeline stage: a bounded input queue drained by N worker threads.
+    With batch_size > 1 each call of fn gets a list of up to batch_size items,
+    collected for at most batch_wait seconds, and returns a list of results.
+    """
+
+    def __init__(self, name, fn, workers=1, queue_size=100, batch_size=1, batch_wait=0.0):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.next_stage = None
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0
+        self._lock = threading.Lock()
+
+    def _count(self, field, delta=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + delta)
+
+
+class IngestPipeline:
+    """
+    Chain of stages. Each stage fn takes an item and returns it (or None to drop it).
+    When a stage raises, on_error(stage name, batch) is called with the items it lost.
+    """
+
+    def __init__(self, logger, on_error=None):
+        self.logger = logger
+        self.on_error = on_error
+        self.stages = []
+        self._threads = []
+
+    def add_stage(self, name, fn, workers=1, queue_size=100, batch_size=1, batch_wait=0.0):
+        stage = Stage(name, fn, workers=workers, queue_size=queue_size,
+                      batch_size=batch_size, batch_wait=batch_wait)
+        if self.stages:
+            self.stages[-1].next_stage = stage
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        for stage in self.stages:
+            for i in range(stage.workers):
+                t = threading.Thread(
+                    target=self._worker, args=(stage,),
+                    name=f"{stage.name}-{i}", daemon=True,
+                )
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, item):
+        """Hand an item to the first stage. Blocks while that stage's queue is full."""
+        self.stages[0].queue.put(item)
+
+    def _next_batch(self, stage):
+        """Block for one item, then keep collecting until the batch is full or batch_wait passes."""
+        batch = [stage.queue.get()]
+        deadline = time.monotonic() + stage.batch_wait
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(stage.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self, stage):
+        while True:
+            batch = self._next_batch(stage)
+            stage._count("busy")
+            try:
+                if stage.batch_size > 1:
+                    outputs = stage.fn(batch)
+                else:
+                    outputs = [stage.fn(batch[0])]
+                for out in outputs:
+                    if out is None:
+                        stage._count("dropped")
+                    else:
+                        stage._count("processed")
+                        if stage.next_stage is not None:
+                            stage.next_stage.queue.put(out)
+            except Exception as e:
+                stage._count("errors", len(batch))
+                self.logger.error(f"Pipeline stage '{stage.name}' error: {e}", exc_info=True)
+                if self.on_error is not None:
+                    try:
+                        self.on_error(stage.name, batch)
+                    except Exception as err:
+                        self.logger.error(f"Pipeline on_error for '{stage.name}' failed: {err}", exc_info=True)
+            finally:
+                stage._count("busy", -1)
+                for _ in batch:
+                    stage.queue.task_done()
+
+    def join(self):
+        """Wait until every queued item has passed through all stages."""
+        for stage in self.stages:
+            stage.queue.join()
+
+    def stats(self):
+        """Per-stage queue depth and counters."""
+        return {
+            stage.name: {
+                "depth": stage.queue.qsize(),
+                "capacity": stage.queue.maxsize,
+                "busy": stage.busy,
+                "workers": stage.workers,
+                "processed": stage.processed,
+                "dropped": stage.dropped,
+                "errors": stage.errors,
+            }
+            for stage in self.stages
+        }
+
+    def log_stats(self):
+        parts = [
+            f"{name}={s['depth']}/{s['capacity']} (busy {s['busy']}/{s['workers']}, done {s['processed']}, err {s['errors']})"
+            for name, s in self.stats().items()
+        ]
+        self.logger.info("Pipeline queues: " + " | ".join(parts))
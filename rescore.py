@@ -0,0 +1,166 @@
+"""
+Offline re-scoring of content_log after weight or keyword changes.
+Streams rows by id in chunks, recomputes the composite risk with RiskScorer.score_batch
+from the stored columns and the stored (or cached) AI risk, and writes each chunk back
+in one short transaction so the listener keeps writing in between.
+Rows stored before ai_score existed take it from the verdict cache (0 for ERROR verdicts,
+as the listener scores them); rows with neither are skipped and counted, never guessed.
+
+    python rescore.py              # full pass from the first row
+    python rescore.py --resume     # continue an interrupted pass from its checkpoint
+"""
+
+import argparse
+import sys
+import time
+
+import db
+from config import RESCORE_CHUNK_ROWS, RESCORE_PAUSE_MS
+from risk_scoring import RiskScorer
+from utils import setup_logging
+from verdict_cache import VerdictCache
+
+JOB_NAME = "composite_risk"
+
+SELECT_SQL = '''
+    SELECT id, title, platform, url, views, virality_vd, tags, ai_score, corroboration_score, panic_score, verdict
+    FROM content_log WHERE id > ? ORDER BY id LIMIT ?
+'''
+
+
+def init_checkpoint_table(conn):
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rescore_checkpoint (
+                job TEXT PRIMARY KEY,
+                last_id INTEGER,
+                rows_done INTEGER,
+                finished INTEGER DEFAULT 0,
+                updated_at REAL
+            )
+        """)
+
+
+def load_checkpoint(conn):
+    row = conn.execute(
+        "SELECT last_id, rows_done, finished FROM rescore_checkpoint WHERE job=?", (JOB_NAME,)
+    ).fetchone()
+    return row or (0, 0, 1)
+
+
+def cached_ai_scores(conn, titles):
+    """Map title -> cached LLM risk for titles without a stored ai_score (TTL ignored)."""
+    keys = {VerdictCache.make_key(title): title for title in titles}
+    if not keys:
+        return {}
+    placeholders = ",".join("?" * len(keys))
+    rows = conn.execute(
+        f"SELECT key, risk FROM llm_verdict_cache WHERE key IN ({placeholders})", list(keys)
+    ).fetchall()
+    return {keys[key]: risk for key, risk in rows}
+
+
+def rescore(db_name="fake_news.db", resume=False, chunk_rows=None, pause_ms=None, logger=None):
+    """Recompute panic_score for every row. Returns (rows updated, rows skipped)."""
+    logger = logger or setup_logging()
+    chunk_rows = chunk_rows or RESCORE_CHUNK_ROWS
+    pause = (RESCORE_PAUSE_MS if pause_ms is None else pause_ms) / 1000
+
+    conn = db.connect(db_name)
+    db.init_schema(conn)
+    VerdictCache(db_name)  # creates llm_verdict_cache if this DB never had one
+    init_checkpoint_table(conn)
+    scorer = RiskScorer()
+
+    last_id, updated, finished = load_checkpoint(conn)
+    if not resume or finished:
+        if resume:
+            logger.info("Rescore: previous pass finished, starting a new one")
+        last_id, updated = 0, 0
+    else:
+        logger.info(f"Rescore: resuming after id {last_id} ({updated} rows already done)")
+
+    skipped = 0
+    start = time.monotonic()
+    try:
+        while True:
+            rows = conn.execute(SELECT_SQL, (last_id, chunk_rows)).fetchall()
+            if not rows:
+                break
+            chunk_last_id = rows[-1][0]
+
+            cached = cached_ai_scores(conn, [r[1] for r in rows if r[7] is None and r[1]])
+            known = []
+            for row in rows:
+                if row[7] is not None:
+                    known.append(row[7])
+                elif row[1] in cached:
+                    known.append(cached[row[1]])
+                elif row[10] == "ERROR":
+                    known.append(0.0)  # the listener scores failed classifications as 0
+                else:
+                    known.append(None)
+
+            scorable = []
+            for row, ai_score in zip(rows, known):
+                if ai_score is None or not row[1]:
+                    skipped += 1
+                    continue
+                scorable.append(row[:7] + (ai_score, row[8]))
+
+            updates = []
+            if scorable:
+                ids, titles, platforms, urls, views, vds, tags, ai_scores, corroboration = zip(*scorable)
+                scores = scorer.score_batch(
+                    titles, platforms, urls,
+                    [v or 0 for v in views], [vd or 0.0 for vd in vds],
+                    ai_scores, corroboration,
+                    tags=[t or '' for t in tags],
+                )
+                updates = [
+                    (float(risk), ai_score, row_id)
+                    for risk, ai_score, row_id in zip(scores['composite_risk'], ai_scores, ids)
+                ]
+
+            # Scores and checkpoint commit together, so a crash never skips or double-counts a chunk
+            with conn:
+                # Cached AI scores are stored, so later passes don't depend on the cache
+                conn.executemany(
+                    "UPDATE content_log SET panic_score=?, ai_score=COALESCE(ai_score, ?) WHERE id=?", updates
+                )
+                updated += len(updates)
+                conn.execute("""
+                    INSERT OR REPLACE INTO rescore_checkpoint (job, last_id, rows_done, finished, updated_at)
+                    VALUES (?, ?, ?, 0, ?)
+                """, (JOB_NAME, chunk_last_id, updated, time.time()))
+            last_id = chunk_last_id
+            logger.info(f"Rescore: up to id {last_id}, {updated} updated, {skipped} skipped (no AI score)")
+            if pause:
+                time.sleep(pause)
+
+        with conn:
+            conn.execute("UPDATE rescore_checkpoint SET finished=1, updated_at=? WHERE job=?", (time.time(), JOB_NAME))
+    finally:
+        conn.close()
+
+    logger.info(f"Rescore finished: {updated} updated, {skipped} skipped in {time.monotonic() - start:.1f}s")
+    if skipped and not updated:
+        logger.error(
+            "Rescore changed nothing: no row has a stored or cached AI score "
+            "(rows older than the ai_score column need re-classifying first)"
+        )
+    elif skipped:
+        logger.warning(f"Rescore: {skipped} rows kept their old score, no stored or cached AI score")
+    return updated, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute composite risk for all of content_log")
+    parser.add_argument("--db", default="fake_news.db")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted pass from its checkpoint")
+    parser.add_argument("--chunk", type=int, default=RESCORE_CHUNK_ROWS, help="rows per transaction")
+    parser.add_argument("--pause-ms", type=int, default=RESCORE_PAUSE_MS, help="sleep between chunks")
+    args = parser.parse_args()
+    updated, skipped = rescore(args.db, resume=args.resume, chunk_rows=args.chunk, pause_ms=args.pause_ms)
+    if skipped and not updated:
+        sys.exit(1)
@@ -0,0 +1,304 @@
+"""
+Retention: keeps fake_news.db small by moving old rows into monthly archive files.
+content_log / spikes rows older than RETENTION_HOT_DAYS are copied into
+archive/fake_news_YYYY_MM.db (same tables, attached for the move) and deleted from the
+hot DB in short transactions. Each archive keeps its own content_fts index, so searches
+reach archived rows (the hot index drops them through its delete trigger); the rollups
+have no delete trigger, so dashboard counts keep covering archived rows.
+Archived URLs are kept in archived_urls so dedup still knows them.
+Each run also hands freed pages back to the filesystem (once auto_vacuum=INCREMENTAL
+has been enabled offline) and truncates the WAL.
+
+Readers see hot and cold rows together through partitions() / attach_span(), which
+only attach archives when the requested range starts before the oldest hot row.
+
+    python -m retention              # one pass now
+    python -m retention --days 14    # keep two weeks hot
+    python -m retention --enable-incremental-vacuum   # one-off, listener stopped
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+import db
+import search_index
+from config import (
+    DASHBOARD_DB,
+    RETENTION_ARCHIVE_DIR,
+    RETENTION_BATCH_ROWS,
+    RETENTION_HOT_DAYS,
+    RETENTION_PAUSE_MS,
+    RETENTION_VACUUM_PAGES,
+)
+from utils import setup_logging
+
+RETENTION_TABLES = ("content_log", "spikes")
+
+
+def month_start(ts):
+    """Epoch seconds of the first instant of ts's UTC month."""
+    day = datetime.fromtimestamp(ts, timezone.utc)
+    return int(day.replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp())
+
+
+def next_month(ts):
+    day = datetime.fromtimestamp(month_start(ts), timezone.utc)
+    if day.month == 12:
+        return int(day.replace(year=day.year + 1, month=1).timestamp())
+    return int(day.replace(month=day.month + 1).timestamp())
+
+
+def archive_dir(conn):
+    """Archives live next to the main database file."""
+    main = next(row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main")
+    return os.path.join(os.path.dirname(main), RETENTION_ARCHIVE_DIR)
+
+
+def archive_name(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("fake_news_%Y_%m")
+
+
+def columns(conn, table, schema="main"):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def partitions(conn, table, since, until=None):
+    """
+    Archive files holding rows of table in [since, until), oldest first.
+    Empty when the hot table still reaches back to since.
+    """
+    hot_floor = conn.execute(f"SELECT MIN(ts) FROM {table}").fetchone()[0]
+    if hot_floor is not None and since >= hot_floor:
+        return []
+    end = until or int(time.time())
+    if hot_floor is not None:
+        end = min(end, hot_floor + 1)
+    directory = archive_dir(conn)
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        try:
+            start = int(datetime.strptime(name, "fake_news_%Y_%m").replace(tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            continue
+        if ext == ".db" and start < end and next_month(start) > since:
+            found.append((name, os.path.join(directory, filename)))
+    return found
+
+
+def attached(conn):
+    return {row[1] for row in conn.execute("PRAGMA database_list")}
+
+
+def cold_select(conn, table, schema, wanted, prefix=''):
+    """SELECT list over an archive, with NULL for columns added to the hot table since."""
+    present = set(columns(conn, table, schema))
+    return ", ".join(f"{prefix}{name}" if name in present else f"NULL AS {name}" for name in wanted)
+
+
+def ensure_search_index(conn, schema):
+    """Give an attached archive its content_fts (archives made before it existed lack one)."""
+    if not search_index.has_index(conn, schema):
+        with conn:
+            search_index.create_index(conn, schema)
+
+
+def attach_partitions(conn, table, since, until=None, search=False):
+    """
+    Attach the archives [since, until) needs (see partitions) on conn; SQLite allows 10
+    by default, i.e. months per query. Returns the names of those holding table, with
+    their search index ensured when search is set.
+    """
+    names = attached(conn)
+    found = []
+    for name, path in partitions(conn, table, since, until):
+        if name not in names:
+            conn.execute("ATTACH DATABASE ? AS " + name, (path,))
+        if not columns(conn, table, name):
+            continue  # nothing of this table was archived that month
+        if search:
+            ensure_search_index(conn, name)
+        found.append(name)
+    return found
+
+
+def attach_span(conn, table, since, until=None):
+    """
+    Name to query instead of table for rows in [since, until): table itself, or a
+    temp view over the hot table UNION ALL the archives the range needs.
+    """
+    return span_view(conn, table, attach_partitions(conn, table, since, until))
+
+
+def span_view(conn, table, parts):
+    """table, or a temp view over it UNION ALL table in the attached archives parts."""
+    if not parts:
+        return table
+    wanted = columns(conn, table)
+    selects = [f"SELECT {', '.join(wanted)} FROM main.{table}"]
+    selects += [f"SELECT {cold_select(conn, table, name, wanted)} FROM {name}.{table}" for name in parts]
+    view = f"{table}_span"
+    conn.execute(f"DROP VIEW IF EXISTS temp.{view}")
+    conn.execute(f"CREATE TEMP VIEW {view} AS " + " UNION ALL ".join(selects))
+    return view
+
+
+class Retention:
+    """Moves old rows to monthly archives and runs vacuum / checkpoint; one run() per schedule tick."""
+
+    def __init__(self, db_name="fake_news.db", logger=None, hot_days=None):
+        self.db_name = db_name
+        self.logger = logger or setup_logging()
+        self.hot_days = RETENTION_HOT_DAYS if hot_days is None else hot_days
+        self.conn = db.connect(db_name)
+        self.stats = {"runs": 0, "archived": 0, "pages_freed": 0}
+
+    def run(self):
+        """One pass: archive, reclaim, checkpoint. Returns rows archived."""
+        started = time.monotonic()
+        if not self.incremental_vacuum_enabled() and not self.stats["runs"]:
+            self.logger.warning(
+                "Retention: auto_vacuum is off, so archived rows free pages inside the file only; "
+                "run python -m retention --enable-incremental-vacuum with the listener stopped"
+            )
+        cutoff = int(time.time()) - int(self.hot_days * 86400)
+        moved = {table: self.archive_table(table, cutoff) for table in RETENTION_TABLES}
+        freed = self.reclaim()
+        busy, wal_pages, _ = self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+
+        total = sum(moved.values())
+        self.stats["runs"] += 1
+        self.stats["archived"] += total
+        self.stats["pages_freed"] += freed
+        self.logger.info(
+            f"Retention: archived {moved['content_log']} content_log / {moved['spikes']} spikes rows "
+            f"older than {self.hot_days}d, freed {freed} pages, "
+            f"WAL checkpoint {'busy' if busy else f'{wal_pages} pages'} ({time.monotonic() - started:.1f}s)"
+        )
+        return total
+
+    def incremental_vacuum_enabled(self):
+        return self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def enable_incremental_vacuum(self):
+        """
+        Switch the hot DB to auto_vacuum=INCREMENTAL. An existing file needs one full
+        VACUUM, which rewrites the whole DB under an exclusive lock: run it offline
+        (python -m retention --enable-incremental-vacuum) with the listener stopped.
+        """
+        if self.incremental_vacuum_enabled():
+            return
+        self.logger.info("Retention: enabling incremental auto_vacuum (full VACUUM)")
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("VACUUM")
+
+    def reclaim(self):
+        """Return up to RETENTION_VACUUM_PAGES free pages to the filesystem. Returns pages freed."""
+        if not self.incremental_vacuum_enabled():
+            return 0
+        before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() would step the pragma once (one page); a script runs it to completion
+        self.conn.executescript(f"PRAGMA incremental_vacuum({RETENTION_VACUUM_PAGES});")
+        return before - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def archive_table(self, table, cutoff):
+        """Move rows of table with ts < cutoff into their month's archive. Returns rows moved."""
+        moved = 0
+        while True:
+            oldest = self.conn.execute(f"SELECT MIN(ts) FROM {table} WHERE ts < ?", (cutoff,)).fetchone()[0]
+            if oldest is None:
+                return moved
+            moved += self._archive_month(table, oldest, min(next_month(oldest), cutoff))
+
+    def _archive_month(self, table, start, end):
+        name = archive_name(start)
+        directory = archive_dir(self.conn)
+        os.makedirs(directory, exist_ok=True)
+        self.conn.execute("ATTACH DATABASE ? AS archive", (os.path.join(directory, name + ".db"),))
+        try:
+            wanted = self._prepare_archive_table(table)
+            cols = ", ".join(wanted)
+            moved = 0
+            while True:
+                ids = [row[0] for row in self.conn.execute(
+                    f"SELECT id FROM main.{table} WHERE ts >= ? AND ts < ? LIMIT ?",
+                    (start, end, RETENTION_BATCH_ROWS),
+                )]
+                if not ids:
+                    return moved
+                placeholders = ",".join("?" * len(ids))
+                # Two transactions: a commit spanning attached WAL databases isn't atomic,
+                # so the copy is made durable and checked before the hot rows go
+                with self.conn:
+                    self.conn.execute(
+                        f"INSERT OR IGNORE INTO archive.{table} ({cols}) "
+                        f"SELECT {cols} FROM main.{table} WHERE id IN ({placeholders})", ids
+                    )
+                copied = self.conn.execute(
+                    f"SELECT COUNT(*) FROM archive.{table} WHERE id IN ({placeholders})", ids
+                ).fetchone()[0]
+                if copied != len(ids):
+                    raise RuntimeError(f"{name}.{table}: {copied} of {len(ids)} rows archived, not deleting")
+                with self.conn:
+                    if table == "content_log":
+                        # Archived URLs stay known to dedup (SeenUrlIndex) so they aren't re-ingested
+                        self.conn.execute(
+                            f"INSERT OR IGNORE INTO archived_urls (url, ts) "
+                            f"SELECT url, ts FROM main.content_log WHERE id IN ({placeholders}) AND url IS NOT NULL", ids
+                        )
+                    self.conn.execute(f"DELETE FROM main.{table} WHERE id IN ({placeholders})", ids)
+                moved += len(ids)
+                # Let the listener's writer get the lock between batches
+                time.sleep(RETENTION_PAUSE_MS / 1000)
+        finally:
+            self.conn.execute("DETACH DATABASE archive")
+
+    def _prepare_archive_table(self, table):
+        """Create table in the attached archive (or add columns it lacks). Returns the hot columns."""
+        info = list(self.conn.execute(f"PRAGMA main.table_info({table})"))
+        wanted = [row[1] for row in info]
+        present = set(columns(self.conn, table, "archive"))
+        with self.conn:
+            if not present:
+                defs = ", ".join(
+                    f"{row[1]} {row[2]}" + (" PRIMARY KEY" if row[5] else "") for row in info
+                )
+                self.conn.execute(f"CREATE TABLE archive.{table} ({defs})")
+                self.conn.execute(f"CREATE INDEX archive.idx_{table}_ts ON {table}(ts)")
+            else:
+                for row in info:
+                    if row[1] not in present:
+                        self.conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {row[1]} {row[2]}")
+        if table == "content_log":
+            # Its triggers index every row copied in below
+            ensure_search_index(self.conn, "archive")
+        return wanted
+
+    def log_stats(self, logger):
+        if not self.stats["runs"]:
+            return
+        logger.info(
+            f"Retention: {self.stats['runs']} runs, {self.stats['archived']} rows archived, "
+            f"{self.stats['pages_freed']} pages freed"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old content_log / spikes rows and compact the DB")
+    parser.add_argument("--db", default=DASHBOARD_DB)
+    parser.add_argument("--days", type=float, default=RETENTION_HOT_DAYS, help="keep this many days hot")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="one-off full VACUUM switching to auto_vacuum=INCREMENTAL (stop the listener first)")
+    args = parser.parse_args()
+
+    conn = db.connect(args.db)
+    db.init_schema(conn)
+    conn.close()
+    retention = Retention(args.db, hot_days=args.days)
+    if args.enable_incremental_vacuum:
+        retention.enable_incremental_vacuum()
+    retention.run()
@@ -3,6 +3,28 @@ Multi-Factor Risk Scoring Engine
 Calculates threat severity based on multiple indicators
 """
 
+import numpy as np
+
+from config import ALL_RISK_KEYWORDS, TECH_RISK_KEYWORDS, DOMAIN_REPUTATION_FILE, HINDI_KEYWORD_EXCLUSIONS
+from domain_reputation import DomainReputation
+from keyword_matcher import KeywordMatcher
+
+PANIC_WEIGHTS = {'extreme': 0.4, 'high': 0.3, 'medium': 0.2, 'financial': 0.35}
+
+PLATFORM_CREDIBILITY = {
+    'Google News': 0.7,
+    'Hacker News': 0.65,
+    'YouTube': 0.4,
+    'Google Trends': 0.5
+}
+
+# Virality tiers for score_batch: value > thresholds[i] moves up one tier,
+# mirroring the if/elif chains in calculate_virality_score
+VIEWS_THRESHOLDS = np.array([10000, 100000, 500000, 1000000])
+VIEWS_TIERS = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+VELOCITY_THRESHOLDS = np.array([100, 1000, 5000, 10000])
+VELOCITY_TIERS = np.array([0.2, 0.4, 0.6, 0.8, 0.95])
+
 class RiskScorer:
     """Calculate composite risk scores from multiple factors"""
     
@@ -23,28 +45,34 @@ class RiskScorer:
             'news.ycombinator.com'
         ]
         
-        # Spam indicators (low credibility)
-        self.spam_indicators = [
-            'blogspot', 'wordpress.com', 'bit.ly', 'tinyurl',
-            'click', 'viral', 'shocking', 'download'
+        # Low-credibility hosts (blog platforms, link shorteners)
+        self.spam_domains = [
+            'blogspot.com', 'wordpress.com', 'bit.ly', 'tinyurl.com'
         ]
+        
+        # Hostname lookup; DOMAIN_REPUTATION_FILE entries extend / override the lists above
+        defaults = {domain: 0.3 for domain in self.trusted_domains}
+        defaults.update({domain: -0.3 for domain in self.spam_domains})
+        self.domains = DomainReputation(defaults, path=DOMAIN_REPUTATION_FILE)
+        
+        self.sensational_keywords = ['shocking', 'unbelievable', 'incredible', 'must see', 'you wont believe']
+        
+        # One automaton for all title keyword lists: panic severities, sensational
+        # phrases, risk keywords (English + Hindi) and the broader HN/tech list
+        self.matcher = KeywordMatcher()
+        for severity, keywords in self.panic_keywords.items():
+            self.matcher.add_all(keywords, severity)
+        self.matcher.add_all(self.sensational_keywords, 'sensational')
+        self.matcher.add_all(ALL_RISK_KEYWORDS, 'risk')
+        self.matcher.add_all(TECH_RISK_KEYWORDS, 'tech')
+        for keyword, words in HINDI_KEYWORD_EXCLUSIONS.items():
+            self.matcher.exclude(keyword, words)
+        self.matcher.build()
     
     def calculate_panic_score(self, title):
         """Analyze text for panic-inducing language. Returns: 0.0 to 1.0"""
-        title_lower = title.lower()
-        score = 0.0
-        
-        for severity, keywords in self.panic_keywords.items():
-            for keyword in keywords:
-                if keyword in title_lower:
-                    if severity == 'extreme':
-                        score += 0.4
-                    elif severity == 'high':
-                        score += 0.3
-                    elif severity == 'medium':
-                        score += 0.2
-                    elif severity == 'financial':
-                        score += 0.35
+        matched = self.matcher.match(title)
+        score = sum(PANIC_WEIGHTS[severity] * len(matched.get(severity, ())) for severity in PANIC_WEIGHTS)
         
         if title.isupper() and len(title) > 10:
             score += 0.2
@@ -52,37 +80,20 @@ class RiskScorer:
         if title.count('!') >= 2 or title.count('?') >= 2:
             score += 0.15
         
-        sensational = ['shocking', 'unbelievable', 'incredible', 'must see', 'you wont believe']
-        if any(word in title_lower for word in sensational):
+        if matched.get('sensational'):
             score += 0.1
         
         return min(score, 1.0)
     
     def calculate_credibility_score(self, platform, url):
         """Assess source credibility. Returns: 0.0 to 1.0 (higher = more credible)"""
-        platform_credibility = {
-            'Google News': 0.7,
-            'Hacker News': 0.65,
-            'YouTube': 0.4,
-            'Google Trends': 0.5
-        }
-        
-        base_cred = platform_credibility.get(platform, 0.5)
+        base_cred = PLATFORM_CREDIBILITY.get(platform, 0.5)
         
-        if not url:
+        delta = self.domains.lookup(url)
+        if delta is None:
             return base_cred
         
-        url_lower = url.lower()
-        
-        for domain in self.trusted_domains:
-            if domain in url_lower:
-                return min(base_cred + 0.3, 1.0)
-        
-        for indicator in self.spam_indicators:
-            if indicator in url_lower:
-                return max(base_cred - 0.3, 0.0)
-        
-        return base_cred
+        return min(max(base_cred + delta, 0.0), 1.0)
     
     def calculate_virality_score(self, views, virality_vd, hours_old=24):
         """Assess spread velocity. Returns: 0.0 to 1.0"""
@@ -111,25 +122,13 @@ class RiskScorer:
         virality_risk = (views_risk * 0.3 + velocity_risk * 0.7)
         return min(virality_risk, 1.0)
     
+    def match_keywords(self, text, category='risk'):
+        """Return the keywords of category (default: risk, English + Hindi) found in text, lowercased."""
+        return sorted(self.matcher.match(text).get(category, ()))
+
     def calculate_keyword_score(self, title, tags):
         """Check for high-risk keywords (English + Hindi). Returns: 0.0 to 1.0"""
-        combined_text = f"{title} {tags}".lower()
-        
-        try:
-            from config import ALL_RISK_KEYWORDS
-            risk_keywords = ALL_RISK_KEYWORDS
-        except ImportError:
-            risk_keywords = [
-                'fake', 'scam', 'deepfake', 'leaked', 'hack',
-                'terrorist', 'bomb', 'explosion', 'death',
-                'urgent', 'breaking', 'alert'
-            ]
-        
-        matches = 0
-        for keyword in risk_keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in combined_text or keyword in combined_text:
-                matches += 1
+        matches = len(self.match_keywords(f"{title} {tags}"))
         
         if matches >= 3:
             return 0.9
@@ -176,3 +175,72 @@ class RiskScorer:
             'ai_score': ai_score,
             'corroboration_score': corroboration_score
         }
+
+    def score_batch(self, titles, platforms, urls, views, virality_vd, ai_score, corroboration, tags=None):
+        """Vectorized calculate_composite_risk over columnar inputs.
+           Keyword matching still runs once per text; all scoring arithmetic is done
+           in NumPy in the same order as the scalar path, so results are identical.
+           corroboration entries may be None (no fact check). Returns a dict of arrays.
+        """
+        n = len(titles)
+        if tags is None:
+            tags = [''] * n
+        
+        # Panic: weighted keyword counts plus the caps / punctuation / sensational bonuses
+        title_matches = [self.matcher.match(title) for title in titles]
+        panic = np.zeros(n)
+        for severity, weight in PANIC_WEIGHTS.items():
+            counts = np.array([len(m.get(severity, ())) for m in title_matches], dtype=float)
+            panic = panic + weight * counts
+        shouting = np.array([t.isupper() and len(t) > 10 for t in titles])
+        punctuated = np.array([t.count('!') >= 2 or t.count('?') >= 2 for t in titles])
+        sensational = np.array([bool(m.get('sensational')) for m in title_matches])
+        panic = np.where(shouting, panic + 0.2, panic)
+        panic = np.where(punctuated, panic + 0.15, panic)
+        panic = np.where(sensational, panic + 0.1, panic)
+        panic = np.minimum(panic, 1.0)
+        
+        # Credibility: platform base plus the URL's domain reputation, if any
+        base_cred = np.array([PLATFORM_CREDIBILITY.get(p, 0.5) for p in platforms])
+        deltas = np.array([self.domains.lookup(u) for u in urls], dtype=float)  # None -> NaN
+        credibility = np.where(
+            np.isnan(deltas),
+            base_cred,
+            np.minimum(np.maximum(base_cred + deltas, 0.0), 1.0),
+        )
+        
+        # Virality: searchsorted(side='left') counts thresholds strictly below the value
+        views = np.asarray(views, dtype=float)
+        virality_vd = np.asarray(virality_vd, dtype=float)
+        views_risk = VIEWS_TIERS[np.searchsorted(VIEWS_THRESHOLDS, views, side='left')]
+        velocity_risk = VELOCITY_TIERS[np.searchsorted(VELOCITY_THRESHOLDS, virality_vd, side='left')]
+        virality = np.minimum(views_risk * 0.3 + velocity_risk * 0.7, 1.0)
+        
+        matches = np.array([len(self.match_keywords(f"{t} {g}")) for t, g in zip(titles, tags)])
+        keywords = np.select([matches >= 3, matches == 2, matches == 1], [0.9, 0.6, 0.4], default=0.1)
+        
+        ai_score = np.asarray(ai_score, dtype=float)
+        composite = (
+            panic * 0.25 +
+            (1 - credibility) * 0.20 +
+            virality * 0.20 +
+            keywords * 0.15 +
+            ai_score * 0.20
+        )
+        
+        corroboration = np.array([np.nan if c is None else c for c in corroboration], dtype=float)
+        composite = np.select(
+            [corroboration == 0.0, corroboration == 1.0],
+            [np.minimum(composite * 1.5, 1.0), composite * 0.5],
+            default=composite,
+        )
+        
+        return {
+            'composite_risk': np.minimum(composite, 1.0),
+            'panic_score': panic,
+            'credibility_score': credibility,
+            'virality_score': virality,
+            'keyword_score': keywords,
+            'ai_score': ai_score,
+            'corroboration_score': corroboration
+        }
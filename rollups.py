@@ -0,0 +1,91 @@
+"""
+Pre-aggregated content_log counts per minute and per hour.
+Triggers on content_log keep rollup_minute / rollup_hour current on every insert and
+on updates of the aggregated columns (e.g. rescore), so dashboard cards and charts
+read a few buckets instead of scanning raw rows. There is deliberately no delete
+trigger: archiving old rows out of content_log keeps their counts.
+"""
+
+ROLLUP_TABLES = {"rollup_minute": 60, "rollup_hour": 3600}
+
+# Expressions over a content_log row (NEW./OLD. prefixed inside triggers)
+RISK_LEVEL_EXPR = """CASE WHEN {r}panic_score >= 0.8 THEN 'CRITICAL'
+         WHEN {r}panic_score >= 0.6 THEN 'HIGH'
+         WHEN {r}panic_score >= 0.4 THEN 'MEDIUM'
+         ELSE 'LOW' END"""
+TS_EXPR = "COALESCE({r}ts, CAST(strftime('%s', {r}timestamp) AS INTEGER))"
+HIGH_VELOCITY_EXPR = "({r}virality_vd > 50 OR {r}views > 50000)"
+
+AGGREGATED_COLUMNS = "ts, platform, verdict, panic_score, virality_vd, views"
+
+
+def _row_values(r, bucket_seconds, sign):
+    """VALUES(...) adding (sign=1) or removing (sign=-1) one row's contribution."""
+    r = f"{r}." if r else ""
+    return f"""(
+        {TS_EXPR.format(r=r)} / {bucket_seconds} * {bucket_seconds},
+        COALESCE({r}platform, ''),
+        COALESCE({r}verdict, ''),
+        {RISK_LEVEL_EXPR.format(r=r)},
+        {sign},
+        {sign} * {HIGH_VELOCITY_EXPR.format(r=r)},
+        {sign} * ({r}panic_score IS NOT NULL),
+        {sign} * COALESCE({r}panic_score, 0)
+    )"""
+
+
+def _upsert(table, values):
+    return f"""
+        INSERT INTO {table} (bucket, platform, verdict, risk_level, items, high_velocity, scored, risk_sum)
+        VALUES {values}
+        ON CONFLICT(bucket, platform, verdict, risk_level) DO UPDATE SET
+            items = items + excluded.items,
+            high_velocity = high_velocity + excluded.high_velocity,
+            scored = scored + excluded.scored,
+            risk_sum = risk_sum + excluded.risk_sum;
+    """
+
+
+def create_rollups(conn):
+    """Create both rollup tables and their triggers, then backfill from content_log."""
+    for table, seconds in ROLLUP_TABLES.items():
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                bucket INTEGER,
+                platform TEXT,
+                verdict TEXT,
+                risk_level TEXT,
+                items INTEGER DEFAULT 0,
+                high_velocity INTEGER DEFAULT 0,
+                scored INTEGER DEFAULT 0,
+                risk_sum REAL DEFAULT 0,
+                PRIMARY KEY (bucket, platform, verdict, risk_level)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON content_log BEGIN
+                {_upsert(table, _row_values('NEW', seconds, 1))}
+            END
+        """)
+        # Also fires when content_log_fill_ts sets ts: old and new land in the same bucket and cancel
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {AGGREGATED_COLUMNS} ON content_log BEGIN
+                {_upsert(table, _row_values('OLD', seconds, -1))}
+                {_upsert(table, _row_values('NEW', seconds, 1))}
+            END
+        """)
+        backfill(conn, table, seconds)
+
+
+def backfill(conn, table, seconds):
+    """Recompute table from the rows currently in content_log."""
+    row = ""
+    conn.execute(f"DELETE FROM {table}")
+    conn.execute(f"""
+        INSERT INTO {table} (bucket, platform, verdict, risk_level, items, high_velocity, scored, risk_sum)
+        SELECT {TS_EXPR.format(r=row)} / {seconds} * {seconds} AS b,
+               COALESCE(platform, '') AS p, COALESCE(verdict, '') AS v, {RISK_LEVEL_EXPR.format(r=row)} AS l,
+               COUNT(*), SUM({HIGH_VELOCITY_EXPR.format(r=row)}),
+               COUNT(panic_score), COALESCE(SUM(panic_score), 0)
+        FROM content_log GROUP BY b, p, v, l
+    """)
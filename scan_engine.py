@@ -0,0 +1,157 @@
+"""
+Concurrent, adaptive scan scheduler.
+Every source runs on a shared thread pool with its own poll interval, priority
+and daily quota. A slow or hung source only delays its own items: nothing waits
+for it, and it is not resubmitted until the stuck run finishes.
+
+Scan callables return the number of new items they queued, or None when they
+did not actually poll (e.g. feed not due yet). Sources that keep returning 0
+back off; sources with new items, or whose platform is spiking, poll faster.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from config import (
+    SCAN_MAX_WORKERS,
+    SOURCE_CONCURRENCY,
+    SOURCE_TIMEOUT_SECONDS,
+    SOURCE_TIMEOUTS,
+    SOURCE_SCHEDULE,
+    SOURCE_SCHEDULE_DEFAULT,
+    SCHEDULER_BACKOFF_FACTOR,
+)
+
+
+class ScanSource:
+    """A named scan callable plus its concurrency group, timeout and schedule."""
+
+    def __init__(self, name, fn, group=None, timeout=None, platform=None):
+        self.name = name
+        self.fn = fn
+        self.group = group or name
+        self.platform = platform or name
+        self.timeout = timeout or SOURCE_TIMEOUTS.get(name, SOURCE_TIMEOUT_SECONDS)
+
+        schedule = dict(SOURCE_SCHEDULE_DEFAULT, **SOURCE_SCHEDULE.get(name, {}))
+        self.priority = schedule["priority"]
+        self.daily_quota = schedule["daily_quota"]
+        self.cost = schedule["cost"]
+        self.max_interval = schedule["max_interval"]
+        self.min_interval = schedule["min_interval"]
+        if self.daily_quota:
+            # Never poll faster than the daily budget can sustain
+            self.min_interval = max(self.min_interval, 86400 * self.cost / self.daily_quota)
+        self.interval = min(max(schedule["interval"], self.min_interval), self.max_interval)
+
+        self.next_due = 0.0
+        self.quota_used = 0
+        self.quota_day = None
+        self.idle_polls = 0
+        self.future = None
+        self.started_at = None
+        self.timed_out = False
+
+    def quota_left(self):
+        today = datetime.now(timezone.utc).date()
+        if self.quota_day != today:
+            self.quota_day = today
+            self.quota_used = 0
+        if not self.daily_quota:
+            return True
+        return self.quota_used + self.cost <= self.daily_quota
+
+    def is_due(self, now):
+        running = self.future is not None and not self.future.done()
+        return not running and now >= self.next_due and self.quota_left()
+
+
+class ScanEngine:
+    """Submit due sources to a shared pool and adapt each source's interval to its results."""
+
+    def __init__(self, logger, max_workers=None, is_spike=None):
+        self.logger = logger
+        self.sources = {}
+        # is_spike(platform) -> bool; a spiking platform is polled at its min interval
+        self.is_spike = is_spike
+        self._group_slots = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or SCAN_MAX_WORKERS,
+            thread_name_prefix="scan",
+        )
+
+    def add_source(self, name, fn, group=None, timeout=None, platform=None):
+        """Register a source. Sources sharing a group share its concurrency limit."""
+        source = ScanSource(name, fn, group=group, timeout=timeout, platform=platform)
+        self.sources[name] = source
+        if source.group not in self._group_slots:
+            limit = SOURCE_CONCURRENCY.get(source.group, 1)
+            self._group_slots[source.group] = threading.BoundedSemaphore(limit)
+        return source
+
+    def _run_source(self, source):
+        with self._group_slots[source.group]:
+            return source.fn()
+
+    def tick(self):
+        """Collect finished runs, flag overdue ones, and submit every due source by priority."""
+        now = time.monotonic()
+        for source in self.sources.values():
+            if source.future is None:
+                continue
+            if source.future.done():
+                self._finish(source, now)
+            elif not source.timed_out and now - source.started_at > source.timeout:
+                source.timed_out = True
+                self.logger.warning(
+                    f"Timeout: {source.name} exceeded {source.timeout}s; other sources continue"
+                )
+
+        due = [s for s in self.sources.values() if s.is_due(now)]
+        for source in sorted(due, key=lambda s: s.priority, reverse=True):
+            source.quota_used += source.cost
+            source.started_at = now
+            source.timed_out = False
+            source.future = self._executor.submit(self._run_source, source)
+
+    def _finish(self, source, now):
+        future, source.future = source.future, None
+        try:
+            new_items = future.result()
+        except Exception as e:
+            self.logger.error(f"Source {source.name} failed: {e}")
+            new_items = 0
+
+        if new_items is None:
+            # Source skipped its poll (nothing due yet); keep the current interval
+            pass
+        elif self.is_spike and self._platform_spiking(source):
+            if source.interval > source.min_interval:
+                self.logger.warning(f"Spike on {source.platform}: polling every {source.min_interval:.0f}s")
+            source.interval = source.min_interval
+            source.idle_polls = 0
+        elif new_items > 0:
+            source.interval = max(source.interval / SCHEDULER_BACKOFF_FACTOR, source.min_interval)
+            source.idle_polls = 0
+        else:
+            source.interval = min(source.interval * SCHEDULER_BACKOFF_FACTOR, source.max_interval)
+            source.idle_polls += 1
+        source.next_due = now + source.interval
+
+        if new_items is not None:
+            self.logger.info(
+                f"{source.name}: {new_items} new in {now - source.started_at:.1f}s, "
+                f"next poll in {source.interval:.0f}s"
+            )
+
+    def _platform_spiking(self, source):
+        try:
+            return self.is_spike(source.platform)
+        except Exception as e:
+            self.logger.error(f"Spike check failed for {source.platform}: {e}")
+            return False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
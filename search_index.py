@@ -0,0 +1,144 @@
+"""
+Full-text search over content_log with SQLite FTS5.
+content_fts is an external-content index (title, tags, ai_explanation, verdict) kept in
+sync by triggers, ranked with BM25. Indic vowel signs and viramas are declared token
+characters, so Hindi/Tamil/... words stay whole instead of splitting at every matra.
+
+    python -m search_index --rebuild        # (re)build the index for an existing DB
+    python -m search_index "deepfake modi"  # ranked search from the shell
+"""
+
+import argparse
+import unicodedata
+
+import db
+
+FTS_COLUMNS = ("title", "tags", "ai_explanation", "verdict")
+# BM25 column weights, in FTS_COLUMNS order: a hit in the headline counts most
+BM25_WEIGHTS = (10.0, 3.0, 2.0, 1.0)
+SNIPPET_TOKENS = 12
+
+INDIC_MARKS = ''.join(
+    chr(cp) for cp in range(0x0900, 0x0D80) if unicodedata.category(chr(cp))[0] == 'M'
+)
+
+RANK_SQL = f"bm25(content_fts, {', '.join(str(w) for w in BM25_WEIGHTS)})"
+SNIPPET_SQL = f"snippet(content_fts, -1, '**', '**', '…', {SNIPPET_TOKENS})"
+
+
+def create_index(conn, schema="main"):
+    """
+    Create content_fts and its sync triggers, and index existing rows.
+    schema may name an attached database (a monthly archive), indexing its content_log.
+    """
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.content_fts USING fts5(
+            {columns},
+            content='content_log', content_rowid='id',
+            tokenize="unicode61 remove_diacritics 2 tokenchars '{INDIC_MARKS}'"
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {schema}.content_fts_insert AFTER INSERT ON content_log BEGIN
+            INSERT INTO content_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {schema}.content_fts_delete AFTER DELETE ON content_log BEGIN
+            INSERT INTO content_fts(content_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {schema}.content_fts_update AFTER UPDATE OF {columns} ON content_log BEGIN
+            INSERT INTO content_fts(content_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO content_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    rebuild(conn, schema)
+
+
+def has_index(conn, schema="main"):
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE name = 'content_fts'"
+    ).fetchone() is not None
+
+
+def rebuild(conn, schema="main"):
+    """Re-index every content_log row (e.g. after bulk edits that bypassed the triggers)."""
+    conn.execute(f"INSERT INTO {schema}.content_fts(content_fts) VALUES ('rebuild')")
+
+
+def match_clause(schemas=("main",), prefix=''):
+    """
+    WHERE condition keeping rows whose id matches the MATCH parameter in the content_fts
+    of each schema (hot DB and attached archives); takes one parameter per schema.
+    content_log ids are AUTOINCREMENT, so they never repeat across archives.
+    """
+    hits = " UNION ALL ".join(
+        f"SELECT rowid FROM {schema}.content_fts WHERE content_fts MATCH ?" for schema in schemas
+    )
+    return f"{prefix}id IN ({hits})"
+
+
+def fts_query(text):
+    """
+    Turn free text into a safe MATCH expression: each word becomes a quoted prefix
+    term ("scam"* also matches "scammers", "मौत"* matches "मौतें"), all required.
+    Returns None when the text has no searchable words.
+    """
+    terms, word = [], []
+    for ch in (text or '') + ' ':
+        if ch.isalnum() or unicodedata.category(ch)[0] == 'M':
+            word.append(ch)
+        elif word:
+            terms.append(''.join(word))
+            word = []
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search(conn, text, since=None, limit=50):
+    """Best BM25 matches for text, optionally only rows with ts >= since."""
+    match = fts_query(text)
+    if match is None:
+        return []
+    sql = f"""
+        SELECT c.id, c.ts, c.platform, c.verdict, c.panic_score, c.title, c.url,
+               {SNIPPET_SQL} AS snippet, {RANK_SQL} AS rank
+        FROM content_fts JOIN content_log c ON c.id = content_fts.rowid
+        WHERE content_fts MATCH ?
+    """
+    params = [match]
+    if since is not None:
+        sql += " AND c.ts >= ?"
+        params.append(since)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+    cursor = conn.execute(sql, params)
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text index for content_log")
+    parser.add_argument("query", nargs="?", help="search text")
+    parser.add_argument("--db", default="fake_news.db")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from content_log")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = db.connect(args.db)
+    db.init_schema(conn)
+    if args.rebuild:
+        with conn:
+            rebuild(conn)
+        count = conn.execute("SELECT COUNT(*) FROM content_log").fetchone()[0]
+        print(f"Indexed {count} rows")
+    if args.query:
+        for hit in search(conn, args.query, limit=args.limit):
+            print(f"{hit['rank']:8.2f}  [{hit['platform']}] {hit['verdict']}  {hit['snippet']}")
+    conn.close()
@@ -0,0 +1,103 @@
+"""
+In-memory index of URLs already in content_log (or archived out of it).
+Checked before enrichment so repeated feed entries never reach the fact-check or LLM calls.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from config import SEEN_URL_INDEX_SIZE
+
+
+class SeenUrlIndex:
+    """Bounded LRU set of seen URLs, loaded from content_log, with a SQLite fallback."""
+
+    def __init__(self, db_name="fake_news.db", max_size=None):
+        self.db_name = db_name
+        self.max_size = max_size or SEEN_URL_INDEX_SIZE
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+        # True while every stored URL is in memory, so a miss needs no DB lookup
+        self._complete = True
+        self.stats = {}
+        self._load()
+
+    def _load(self):
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        try:
+            rows = conn.execute(
+                "SELECT url FROM content_log ORDER BY id DESC LIMIT ?",
+                (self.max_size + 1,),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+        if len(rows) > self.max_size or self._has_archived():
+            self._complete = False
+            rows = rows[:self.max_size]
+        for (url,) in reversed(rows):
+            self._urls[url] = None
+
+    def _has_archived(self):
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        try:
+            return conn.execute("SELECT 1 FROM archived_urls LIMIT 1").fetchone() is not None
+        except sqlite3.OperationalError:
+            return False
+        finally:
+            conn.close()
+
+    def _in_db(self, url):
+        # Rows moved out by retention.py leave their URL in archived_urls
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        try:
+            return conn.execute(
+                "SELECT 1 FROM content_log WHERE url=? UNION ALL SELECT 1 FROM archived_urls WHERE url=?",
+                (url, url),
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def _remember(self, url):
+        self._urls[url] = None
+        self._urls.move_to_end(url)
+        if len(self._urls) > self.max_size:
+            self._urls.popitem(last=False)
+            self._complete = False
+
+    def check_and_add(self, url, source):
+        """
+        Return True if url was already seen (caller should skip it).
+        Unseen URLs are recorded immediately so in-flight duplicates are skipped too.
+        """
+        with self._lock:
+            counts = self.stats.setdefault(source, {"checked": 0, "skipped": 0})
+            counts["checked"] += 1
+            if url in self._urls:
+                self._urls.move_to_end(url)
+                counts["skipped"] += 1
+                return True
+            complete = self._complete
+
+        seen = not complete and self._in_db(url)
+        with self._lock:
+            self._remember(url)
+            if seen:
+                counts["skipped"] += 1
+        return seen
+
+    def forget(self, url):
+        """Drop url (e.g. its item failed to save) so the next check_and_add lets it through."""
+        with self._lock:
+            self._urls.pop(url, None)
+
+    def log_stats(self, logger):
+        with self._lock:
+            parts = [
+                f"{source} {c['skipped']}/{c['checked']} ({c['skipped'] / c['checked']:.0%})"
+                for source, c in sorted(self.stats.items()) if c["checked"]
+            ]
+        if parts:
+            logger.info("Seen-URL skips: " + " | ".join(parts))
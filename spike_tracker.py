@@ -1,83 +1,260 @@
 """
 Track content volume over time to detect true spikes.
 True spike = platform volume (items/hour) exceeds baseline by configured multiplier.
+
+Volumes come from per-platform ring buffers of hourly counts, filled from the DB
+once at startup and bumped on every insert, so a check never scans content_log.
+
+StreamingSpikeDetector adds multi-window (5m / 1h / 24h) EWMA z-score detection
+per platform, verdict and keyword, e.g. "SCAM headlines doubled in 10 minutes".
 """
 
-import sqlite3
-from datetime import datetime, timedelta
+import math
+import threading
+import time
+
+import db
 from config import (
     SPIKE_BASELINE_HOURS,
     SPIKE_MULTIPLIER,
     SPIKE_MIN_BASELINE_ITEMS,
+    SPIKE_EWMA_WINDOWS,
+    SPIKE_EWMA_Z_THRESHOLD,
+    SPIKE_EWMA_MIN_COUNT,
+    SPIKE_EWMA_MIN_EVENTS,
+    SPIKE_EWMA_WARMUP_WINDOWS,
 )
 
 
+class HourlyCounter:
+    """Ring buffer of item counts for the last `hours` clock hours (including the current one)."""
+
+    def __init__(self, hours):
+        self.size = hours + 1
+        self.counts = [0] * self.size
+        self.current_hour = None
+
+    def _advance(self, hour):
+        """Zero the slots of hours that passed since the last update."""
+        if self.current_hour is None:
+            self.current_hour = hour
+            return
+        steps = min(hour - self.current_hour, self.size)
+        for h in range(self.current_hour + 1, self.current_hour + 1 + steps):
+            self.counts[h % self.size] = 0
+        self.current_hour = max(self.current_hour, hour)
+
+    def add(self, hour, n=1):
+        self._advance(hour)
+        if self.current_hour - hour < self.size:
+            self.counts[hour % self.size] += n
+
+    def count(self, now_hour, hours):
+        """Items in the current hour and the `hours - 1` full hours before it."""
+        self._advance(now_hour)
+        hours = min(hours, self.size)
+        return sum(self.counts[(now_hour - i) % self.size] for i in range(hours))
+
+    def sliding_count(self, now):
+        """Approximate items in the last 60 minutes: this hour plus the unexpired share of the last."""
+        now_hour = int(now // 3600)
+        self._advance(now_hour)
+        elapsed = (now % 3600) / 3600
+        previous = self.counts[(now_hour - 1) % self.size]
+        return self.counts[now_hour % self.size] + previous * (1 - elapsed)
+
+
+class EwmaWindow:
+    """
+    Constant-size state for one series and window:
+    `count` decays with time constant `window` (~items in the last window);
+    `mean` / `var` are its EWMA over `horizon`, sampled at each event and
+    weighted by the time since the previous one. Sampling starts once the series
+    is a window old (before that `count` is still ramping up), and the baseline
+    is bias-corrected by `weight` so it is usable before a full horizon has passed.
+    """
+
+    __slots__ = ("window", "horizon", "count", "mean", "var", "weight",
+                 "first_ts", "last_ts", "events", "cooldown_until")
+
+    def __init__(self, window, horizon):
+        self.window = window
+        self.horizon = horizon
+        self.count = 0.0
+        self.mean = 0.0
+        self.var = 0.0
+        self.weight = 0.0
+        self.first_ts = None
+        self.last_ts = None
+        self.events = 0
+        self.cooldown_until = 0.0
+
+    def update(self, ts):
+        """Add one event at ts. Returns the z-score if this event makes the window spike, else None."""
+        if self.last_ts is None:
+            self.first_ts = ts
+        else:
+            dt = max(ts - self.last_ts, 0.0)
+            self.count *= math.exp(-dt / self.window)
+            if ts - self.first_ts >= self.window:
+                alpha = 1.0 - math.exp(-dt / self.horizon)
+                diff = self.count - self.mean
+                self.mean += alpha * diff
+                self.var = (1.0 - alpha) * (self.var + alpha * diff * diff)
+                self.weight += alpha * (1.0 - self.weight)
+        self.last_ts = ts
+        self.events += 1
+        self.count += 1.0
+
+        if (self.events < SPIKE_EWMA_MIN_EVENTS or self.count < SPIKE_EWMA_MIN_COUNT
+                or ts - self.first_ts < 2 * self.window or self.weight <= 0.0):
+            return None
+        mean, var = self.baseline()
+        # Poisson floor: a near-constant baseline must not make tiny bumps look huge
+        z = (self.count - mean) / math.sqrt(max(var, mean, 1.0))
+        if ts >= self.cooldown_until and self.count > SPIKE_MULTIPLIER * mean and z >= SPIKE_EWMA_Z_THRESHOLD:
+            self.cooldown_until = ts + self.window
+            return z
+        return None
+
+    def baseline(self):
+        """Bias-corrected (mean, variance) of the windowed count."""
+        if self.weight <= 0.0:
+            return 0.0, 0.0
+        return self.mean / self.weight, self.var / self.weight
+
+
+class StreamingSpikeDetector:
+    """O(1)-per-item spike detection over several windows for many (dimension, value) series."""
+
+    def __init__(self, windows=None):
+        self.windows = windows or SPIKE_EWMA_WINDOWS
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, ts, **dimensions):
+        """
+        Record one item, e.g. observe(ts, platform="NDTV", verdict="SCAM", keyword=["scam", "fake"]).
+        Returns a list of fired events: dicts with series, window, rate and baseline (items/hour), z.
+        """
+        events = []
+        with self._lock:
+            for dimension, values in dimensions.items():
+                if values is None:
+                    continue
+                if isinstance(values, str):
+                    values = [values]
+                for value in set(values):
+                    series = f"{dimension}:{value}"
+                    windows = self._series.get(series)
+                    if windows is None:
+                        windows = self._series[series] = {
+                            name: EwmaWindow(window, horizon)
+                            for name, (window, horizon) in self.windows.items()
+                        }
+                    for name, state in windows.items():
+                        z = state.update(ts)
+                        if z is not None:
+                            per_hour = 3600.0 / state.window
+                            events.append({
+                                "series": series,
+                                "window": name,
+                                "rate": state.count * per_hour,
+                                "baseline": state.baseline()[0] * per_hour,
+                                "z": z,
+                            })
+        return events
+
+
 class SpikeTracker:
     """Detect volume spikes by comparing recent rate to historical baseline."""
 
-    def __init__(self, db_name="fake_news.db"):
+    def __init__(self, db_name="fake_news.db", match_keywords=None):
+        """match_keywords(title) -> keywords, as stored items are observed with (for the warm-up)."""
         self.db_name = db_name
+        self.match_keywords = match_keywords
+        # One long-lived connection shared by the pipeline threads
+        self._conn = db.connect(db_name)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self.detector = StreamingSpikeDetector()
         self._init_spikes_table()
-
-    def _get_conn(self):
-        conn = sqlite3.connect(self.db_name, timeout=10)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")
-        return conn
+        self._load_counters()
+        self._warm_detector()
 
     def _init_spikes_table(self):
-        """Create spikes table if it doesn't exist."""
-        conn = self._get_conn()
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS spikes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    platform TEXT,
-                    title TEXT,
-                    spike_rate REAL,
-                    baseline_rate REAL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
-        finally:
-            conn.close()
+        """Create spikes table (and run schema migrations) if needed."""
+        with self._lock:
+            db.init_schema(self._conn)
+
+    def _load_counters(self):
+        """Fill the hourly ring buffers from content_log once at startup."""
+        since = int(time.time()) - (SPIKE_BASELINE_HOURS + 1) * 3600
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT platform, ts / 3600 AS hour, COUNT(*)
+                FROM content_log
+                WHERE ts >= ?
+                GROUP BY platform, hour
+            """, (since,)).fetchall()
+        for platform, hour, count in rows:
+            self._counter(platform).add(hour, count)
+
+    def _warm_detector(self):
+        """
+        Replay recent items (platform, verdict and, given match_keywords, title keywords)
+        so the EWMA baselines start warm. A window can only fire once its series is
+        2 windows old, so the replay reaches a little further back than that.
+        """
+        longest = max(window for window, _ in self.detector.windows.values())
+        since = int(time.time()) - int(SPIKE_EWMA_WARMUP_WINDOWS * longest)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, platform, verdict, title FROM content_log WHERE ts >= ? ORDER BY ts",
+                (since,),
+            ).fetchall()
+        for ts, platform, verdict, title in rows:
+            keywords = self.match_keywords(title) if self.match_keywords and title else None
+            self.detector.observe(ts, platform=platform, verdict=verdict, keyword=keywords)
+
+    def observe(self, platform, verdict, keywords=(), ts=None):
+        """Feed one stored item to the streaming detector. Returns the spike events it fired."""
+        return self.detector.observe(ts or time.time(), platform=platform, verdict=verdict, keyword=list(keywords))
+
+    def _counter(self, platform):
+        counter = self._counters.get(platform)
+        if counter is None:
+            counter = self._counters[platform] = HourlyCounter(SPIKE_BASELINE_HOURS)
+        return counter
+
+    def record(self, platform, ts=None):
+        """Count one newly stored item for platform (call after each insert)."""
+        ts = ts or time.time()
+        with self._lock:
+            self._counter(platform).add(int(ts // 3600))
 
     def get_baseline_volume(self, platform, hours=None):
         """
         Get average content volume (items/hour) for platform over last N hours.
         Returns 0 if insufficient data.
         """
-        hours = hours or SPIKE_BASELINE_HOURS
-        conn = self._get_conn()
-        try:
-            cursor = conn.cursor()
-            cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-            cursor.execute("""
-                SELECT COUNT(*) FROM content_log
-                WHERE platform = ? AND timestamp > ?
-            """, (platform, cutoff))
-            count = cursor.fetchone()[0]
-            if count < SPIKE_MIN_BASELINE_ITEMS:
-                return 0.0
-            return count / hours
-        finally:
-            conn.close()
+        hours = min(hours or SPIKE_BASELINE_HOURS, SPIKE_BASELINE_HOURS)
+        with self._lock:
+            count = self._counter(platform).count(int(time.time() // 3600), hours)
+        if count < SPIKE_MIN_BASELINE_ITEMS:
+            return 0.0
+        return count / hours
 
     def get_recent_volume(self, platform, hours=1):
         """Get items per hour for platform in the last N hours."""
-        conn = self._get_conn()
-        try:
-            cursor = conn.cursor()
-            cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-            cursor.execute("""
-                SELECT COUNT(*) FROM content_log
-                WHERE platform = ? AND timestamp > ?
-            """, (platform, cutoff))
-            count = cursor.fetchone()[0]
-            return count / hours if hours > 0 else 0.0
-        finally:
-            conn.close()
+        if hours <= 0:
+            return 0.0
+        with self._lock:
+            counter = self._counter(platform)
+            if hours == 1:
+                return counter.sliding_count(time.time())
+            count = counter.count(int(time.time() // 3600), hours)
+        return count / hours
 
     def is_spike(self, platform, recent_hours=1):
         """
@@ -91,16 +268,14 @@ class SpikeTracker:
         threshold = baseline * SPIKE_MULTIPLIER
         return recent_rate > threshold, recent_rate, baseline
 
-    def log_spike(self, platform, title, spike_rate, baseline_rate):
-        """Persist spike event for audit and analysis."""
-        conn = self._get_conn()
+    def log_spike(self, platform, title, spike_rate, baseline_rate, window="1h", series=None):
+        """Persist spike event for audit and analysis. platform is None for cross-platform series."""
         try:
-            conn.execute("""
-                INSERT INTO spikes (platform, title, spike_rate, baseline_rate)
-                VALUES (?, ?, ?, ?)
-            """, (platform, (title or "")[:500], spike_rate, baseline_rate))
-            conn.commit()
+            with self._lock, self._conn:
+                self._conn.execute("""
+                    INSERT INTO spikes (platform, title, spike_rate, baseline_rate, ts, window, series)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (platform, (title or "")[:500], spike_rate, baseline_rate, int(time.time()),
+                      window, series or f"platform:{platform}"))
         except Exception as e:
             pass  # Non-fatal; don't break the listener
-        finally:
-            conn.close()
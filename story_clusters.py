@@ -0,0 +1,224 @@
+"""
+Near-duplicate story clustering across platforms.
+Headlines are reduced to word sets (normalize_title) and indexed with MinHash LSH;
+band collisions are confirmed with exact Jaccard similarity. Each cluster gets a
+story_id, keeps the first AI verdict so later copies skip the LLM, and counts the
+platforms it has appeared on. Only clusters active within STORY_WINDOW_HOURS stay
+in memory; the story_clusters table keeps everything.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import db
+from config import (
+    STORY_WINDOW_HOURS,
+    STORY_JACCARD_THRESHOLD,
+    STORY_MINHASH_BANDS,
+    STORY_MINHASH_ROWS,
+)
+from utils import normalize_title
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = random.Random(0)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(STORY_MINHASH_BANDS * STORY_MINHASH_ROWS)
+]
+
+
+def title_tokens(title):
+    return frozenset(normalize_title(title or '').split())
+
+
+def minhash(tokens):
+    """MinHash signature of a token set (one value per permutation)."""
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode('utf-8'), digest_size=8).digest(), 'big') for t in tokens]
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class Story:
+    """One cluster: its representative tokens, first verdict and per-platform counts."""
+
+    __slots__ = ("story_id", "tokens", "bands", "last_ts", "verdict", "platform_counts", "item_count")
+
+    def __init__(self, story_id, tokens, last_ts, verdict=None, platform_counts=None, item_count=0):
+        self.story_id = story_id
+        self.tokens = tokens
+        signature = minhash(tokens)
+        rows = STORY_MINHASH_ROWS
+        self.bands = [tuple(signature[i:i + rows]) for i in range(0, len(signature), rows)]
+        self.last_ts = last_ts
+        self.verdict = verdict
+        self.platform_counts = platform_counts or {}
+        self.item_count = item_count
+
+
+class StoryIndex:
+    """MinHash LSH index of recent stories, persisted in story_clusters."""
+
+    def __init__(self, db_name="fake_news.db", window_hours=None):
+        self.window = (window_hours or STORY_WINDOW_HOURS) * 3600
+        self.conn = db.connect(db_name)
+        self._lock = threading.Lock()
+        # story_id -> Story, least recently seen first
+        self.stories = OrderedDict()
+        self._buckets = [{} for _ in range(STORY_MINHASH_BANDS)]
+        self.created = 0
+        self.matched = 0
+        self.verdicts_reused = 0
+        self._init_table()
+        self._warm()
+
+    def _init_table(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS story_clusters (
+                    story_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT,
+                    verdict TEXT,
+                    risk REAL,
+                    reason TEXT,
+                    platform_counts TEXT DEFAULT '{}',
+                    item_count INTEGER DEFAULT 0,
+                    first_ts INTEGER,
+                    last_ts INTEGER
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_story_clusters_last_ts ON story_clusters(last_ts)")
+
+    def _warm(self):
+        """Reload clusters still inside the window so restarts keep matching them."""
+        rows = self.conn.execute("""
+            SELECT story_id, title, verdict, risk, reason, platform_counts, item_count, last_ts
+            FROM story_clusters WHERE last_ts >= ? ORDER BY last_ts
+        """, (int(time.time() - self.window),)).fetchall()
+        for story_id, title, verdict, risk, reason, counts, item_count, last_ts in rows:
+            tokens = title_tokens(title)
+            if not tokens:
+                continue
+            analysis = {"verdict": verdict, "risk": risk, "reason": reason} if verdict else None
+            self._add(Story(story_id, tokens, last_ts, analysis, json.loads(counts or '{}'), item_count))
+
+    def _add(self, story):
+        self.stories[story.story_id] = story
+        for buckets, band in zip(self._buckets, story.bands):
+            buckets.setdefault(band, set()).add(story.story_id)
+
+    def _expire(self, now):
+        cutoff = now - self.window
+        while self.stories:
+            story = next(iter(self.stories.values()))
+            if story.last_ts >= cutoff:
+                break
+            del self.stories[story.story_id]
+            for buckets, band in zip(self._buckets, story.bands):
+                members = buckets.get(band)
+                if members is not None:
+                    members.discard(story.story_id)
+                    if not members:
+                        del buckets[band]
+
+    def _touch(self, story, ts):
+        story.last_ts = max(story.last_ts, ts)
+        self.stories.move_to_end(story.story_id)
+
+    def assign(self, title, ts=None):
+        """Return the story_id for title, opening a new cluster if nothing is similar enough."""
+        tokens = title_tokens(title)
+        if not tokens:
+            return None
+        ts = int(ts or time.time())
+        probe = Story(None, tokens, ts)
+        with self._lock:
+            self._expire(ts)
+            candidates = set()
+            for buckets, band in zip(self._buckets, probe.bands):
+                candidates |= buckets.get(band, set())
+            best, best_score = None, STORY_JACCARD_THRESHOLD
+            for story_id in candidates:
+                score = jaccard(tokens, self.stories[story_id].tokens)
+                if score >= best_score:
+                    best, best_score = self.stories[story_id], score
+            if best is not None:
+                self.matched += 1
+                self._touch(best, ts)
+                return best.story_id
+
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO story_clusters (title, first_ts, last_ts) VALUES (?, ?, ?)",
+                    (title, ts, ts),
+                )
+            probe.story_id = cursor.lastrowid
+            self._add(probe)
+            self.created += 1
+            return probe.story_id
+
+    def cached_verdict(self, story_id):
+        """The cluster's first {"verdict", "risk", "reason"}, or None."""
+        with self._lock:
+            story = self.stories.get(story_id)
+            if story is None or story.verdict is None:
+                return None
+            self.verdicts_reused += 1
+            return dict(story.verdict)
+
+    def set_verdict(self, story_id, analysis):
+        """Record the cluster's verdict unless it already has one. LLM errors are not kept."""
+        if analysis.get("verdict") == "ERROR":
+            return
+        with self._lock:
+            story = self.stories.get(story_id)
+            if story is None or story.verdict is not None:
+                return
+            story.verdict = {k: analysis.get(k) for k in ("verdict", "risk", "reason")}
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE story_clusters SET verdict=?, risk=?, reason=? WHERE story_id=?",
+                    (story.verdict["verdict"], story.verdict["risk"], story.verdict["reason"], story_id),
+                )
+
+    def add_members(self, items):
+        """
+        Count stored items (dicts with story_id, platform, ts) in one transaction.
+        Returns {story_id: platform_counts} for stories that gained a new platform.
+        """
+        spread = {}
+        with self._lock:
+            touched = {}
+            for item in items:
+                story = self.stories.get(item.get('story_id'))
+                if story is None:
+                    continue
+                if item['platform'] not in story.platform_counts:
+                    spread[story.story_id] = story.platform_counts
+                story.platform_counts[item['platform']] = story.platform_counts.get(item['platform'], 0) + 1
+                story.item_count += 1
+                self._touch(story, item['ts'])
+                touched[story.story_id] = story
+            if touched:
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE story_clusters SET platform_counts=?, item_count=?, last_ts=? WHERE story_id=?",
+                        [(json.dumps(s.platform_counts), s.item_count, s.last_ts, s.story_id) for s in touched.values()],
+                    )
+            return {story_id: dict(counts) for story_id, counts in spread.items()}
+
+    def log_stats(self, logger):
+        with self._lock:
+            live, created, matched, reused = len(self.stories), self.created, self.matched, self.verdicts_reused
+        if created or matched:
+            logger.info(
+                f"Stories: {live} live clusters, {created} new, {matched} near-duplicates, "
+                f"{reused} verdicts reused"
+            )
@@ -5,6 +5,8 @@ Utility functions for IICCC system
 import logging
 from datetime import datetime
 import os
+import re
+import unicodedata
 
 def setup_logging():
     """Configure logging for the entire system"""
@@ -43,3 +45,21 @@ def setup_logging():
     logger.addHandler(console_handler)
     
     return logger
+
+
+def normalize_title(title):
+    """
+    Normalize a headline for cache keys and duplicate detection:
+    Unicode NFKC, casefolded, punctuation stripped, and a trailing
+    " - Publisher" / " | Publisher" suffix (as added by Google News) removed.
+    """
+    text = unicodedata.normalize('NFKC', title or '').strip()
+    parts = re.split(r'\s+[-|–—]\s+', text)
+    if len(parts) > 1 and len(parts[-1].split()) <= 4:
+        text = ' '.join(parts[:-1])
+    # Keep letters, digits and combining marks (Devanagari vowel signs are marks, not \w)
+    text = ''.join(
+        ch if unicodedata.category(ch)[0] in 'LNM' else ' '
+        for ch in text.casefold()
+    )
+    return ' '.join(text.split())
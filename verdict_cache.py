@@ -0,0 +1,113 @@
+"""
+Persistent LLM verdict cache keyed by a hash of the normalized headline.
+The same story arriving from several platforms is classified once.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from config import LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES
+from utils import normalize_title
+
+
+class VerdictCache:
+    """SQLite-backed verdict cache with TTL expiry and size-based (LRU) eviction."""
+
+    # Run the expiry/size sweep once per this many writes
+    EVICT_EVERY = 100
+
+    def __init__(self, db_name="fake_news.db", ttl_hours=None, max_entries=None):
+        self.db_name = db_name
+        self.ttl = (ttl_hours or LLM_CACHE_TTL_HOURS) * 3600
+        self.max_entries = max_entries or LLM_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._init_table()
+
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_name, timeout=10)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _init_table(self):
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_verdict_cache (
+                    key TEXT PRIMARY KEY,
+                    verdict TEXT,
+                    risk REAL,
+                    reason TEXT,
+                    created_at REAL,
+                    last_used REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_verdict_cache(last_used)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(title):
+        return hashlib.sha1(normalize_title(title).encode('utf-8')).hexdigest()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, title):
+        """Return the cached {"verdict", "risk", "reason"} for title, or None."""
+        key = self.make_key(title)
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            row = conn.execute(
+                "SELECT verdict, risk, reason FROM llm_verdict_cache WHERE key=? AND created_at>?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE llm_verdict_cache SET last_used=? WHERE key=?", (now, key))
+                conn.commit()
+        finally:
+            conn.close()
+        self._count(row is not None)
+        if row is None:
+            return None
+        return {"verdict": row[0], "risk": row[1], "reason": row[2]}
+
+    def put(self, title, analysis):
+        """Store a verdict. Evicts expired and least recently used entries over the size cap."""
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO llm_verdict_cache (key, verdict, risk, reason, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (self.make_key(title), analysis["verdict"], analysis["risk"], analysis["reason"], now, now))
+            with self._lock:
+                self._puts += 1
+                evict = self._puts % self.EVICT_EVERY == 0
+            if evict:
+                conn.execute("DELETE FROM llm_verdict_cache WHERE created_at<=?", (now - self.ttl,))
+                conn.execute("""
+                    DELETE FROM llm_verdict_cache WHERE key IN (
+                        SELECT key FROM llm_verdict_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def log_stats(self, logger):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        if total:
+            logger.info(f"LLM verdict cache: {hits} hits, {misses} misses ({hits / total:.0%} hit rate)")